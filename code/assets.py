@@ -0,0 +1,88 @@
+import pygame
+import os
+
+# images live next to the code, whatever the current working directory is
+IMAGE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+
+# every sprite loaded so far, keyed by (file name, flipped upside down)
+IMAGES = {}
+# every mask built so far, same keys as the images
+MASKS = {}
+# once the display is set, new sprites are converted to its pixel format
+CONVERT = False
+# functions to call once every sprite has been converted, so anything that
+# held on to the old surfaces can pick up the new ones
+CONVERT_CALLBACKS = []
+# every font opened so far, keyed by (font name, size)
+FONTS = {}
+# font the HUD text is drawn in. None is pygame's own bundled font, which
+# opens without scanning the system font directories. a system font name
+# (like "aptos") works too, at the cost of that scan the first time
+HUD_FONT = None
+
+def start(display):
+    # initialize only the pygame parts a mode needs. loading images and
+    # building masks need nothing, so headless runs skip this completely
+    if display:
+        pygame.display.init()
+        pygame.font.init()
+
+def image(name, flipped=False):
+    # load, scale (and flip) a sprite the first time it's asked for, then
+    # keep handing back the same surface
+    key = (name, flipped)
+    surface = IMAGES.get(key)
+    if surface is None:
+        if flipped:
+            surface = pygame.transform.flip(image(name), False, True)
+        else:
+            surface = pygame.transform.scale2x(pygame.image.load(os.path.join(IMAGE_DIRECTORY, name + ".png")))
+        if CONVERT:
+            surface = surface.convert_alpha()
+        IMAGES[key] = surface
+    return surface
+
+def mask(name, flipped=False):
+    # pixel perfect mask of a sprite, built once
+    key = (name, flipped)
+    sprite_mask = MASKS.get(key)
+    if sprite_mask is None:
+        sprite_mask = pygame.mask.from_surface(image(name, flipped))
+        MASKS[key] = sprite_mask
+    return sprite_mask
+
+def convert():
+    # swap every sprite for a copy in the display's pixel format, which is
+    # much faster to blit. needs the display mode to be set already
+    global CONVERT
+    if CONVERT:
+        return
+    CONVERT = True
+    for key, surface in IMAGES.items():
+        IMAGES[key] = surface.convert_alpha()
+    for callback in CONVERT_CALLBACKS:
+        callback()
+
+def on_convert(callback):
+    # call callback() after the sprites get converted
+    CONVERT_CALLBACKS.append(callback)
+
+def font_path(name):
+    # the font file for a system font name, or None for pygame's own
+    # bundled font. only a name needs the system font scan (pygame keeps
+    # it for the rest of the process), and a name that isn't found falls
+    # back to the bundled font, same as SysFont
+    if name is None:
+        return None
+    return pygame.font.match_font(name)
+
+def font(name, size):
+    # open a font the first time it's asked for, then keep handing it back
+    key = (name, size)
+    opened_font = FONTS.get(key)
+    if opened_font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        opened_font = pygame.font.Font(font_path(name), size)
+        FONTS[key] = opened_font
+    return opened_font
@@ -0,0 +1,152 @@
+import numpy as np
+from neat.graphs import feed_forward_layers
+
+# numpy versions of the neat activation functions, with the same clamping
+# neat-python applies before each function
+ACTIVATIONS = {
+    "sigmoid": lambda z: 1.0 / (1.0 + np.exp(-np.clip(5.0 * z, -60.0, 60.0))),
+    "tanh": lambda z: np.tanh(np.clip(2.5 * z, -60.0, 60.0)),
+    "relu": lambda z: np.where(z > 0.0, z, 0.0),
+    "identity": lambda z: z,
+    "clamped": lambda z: np.clip(z, -1.0, 1.0),
+    "abs": lambda z: np.abs(z),
+}
+
+class BatchNetwork:
+    # a network output above this makes the bird jump
+    JUMP_THRESHOLD = 0.5
+
+    def __init__(self, num_inputs, output_slots, layers):
+        # how many inputs every network takes
+        self.num_inputs = num_inputs
+        # for every network, which value slot holds each of its outputs
+        self.output_slots = output_slots
+        # one (weights, biases, responses, activations) entry per layer
+        self.layers = layers
+        # total value slots: inputs, every layer's nodes, then an always-zero
+        # slot for outputs that nothing is connected to
+        self.num_slots = num_inputs + sum(biases.shape[1] for _, biases, _, _ in layers) + 1
+        # where every network's outputs are in the flattened value table
+        self.output_indices = np.arange(output_slots.shape[0])[:, None] * self.num_slots + output_slots
+        # for every layer, the activation functions it actually uses and
+        # which of its nodes use them, so activating skips the others
+        self.groups = []
+        for weights, biases, responses, activations in layers:
+            self.groups.append([(function, activations == a)
+                                for a, function in enumerate(ACTIVATIONS.values())
+                                if (activations == a).any()])
+
+    def __len__(self):
+        return self.output_slots.shape[0]
+
+    def select(self, rows):
+        # a batch network of only the given networks, in the given order.
+        # activating it without rows skips gathering the matrices every time
+        rows = np.asarray(rows, dtype=np.int64)
+        layers = [(weights[rows], biases[rows], responses[rows], activations[rows])
+                  for weights, biases, responses, activations in self.layers]
+        return BatchNetwork(self.num_inputs, self.output_slots[rows], layers)
+
+    @staticmethod
+    def compile(genome, config):
+        # one genome's nodes in the same evaluation order
+        # FeedForwardNetwork.create uses: a list of layers, each a list of
+        # (node, node gene, incoming links)
+        genome_config = config.genome_config
+        connections = [cg.key for cg in genome.connections.values() if cg.enabled]
+        layers = feed_forward_layers(genome_config.input_keys, genome_config.output_keys, connections)
+        node_evals = []
+        for layer in layers:
+            layer_evals = []
+            for node in layer:
+                node_gene = genome.nodes[node]
+                if node_gene.aggregation != "sum":
+                    raise RuntimeError("BatchNetwork only supports sum aggregation, got {0!r}".format(node_gene.aggregation))
+                if node_gene.activation not in ACTIVATIONS:
+                    raise RuntimeError("BatchNetwork does not support {0!r} activation".format(node_gene.activation))
+                links = [(i, genome.connections[(i, o)].weight) for i, o in connections if o == node]
+                layer_evals.append((node, node_gene, links))
+            node_evals.append(layer_evals)
+        return node_evals
+
+    @staticmethod
+    def create(genomes, config, compile=None):
+        # compile a whole generation of genomes into padded matrices, one set
+        # per topological layer, so every network can be activated at once.
+        # compile can hand back already compiled genomes (a NetworkCache)
+        genome_config = config.genome_config
+        input_keys = genome_config.input_keys
+        output_keys = genome_config.output_keys
+        num_inputs = len(input_keys)
+
+        if compile is None:
+            compile = BatchNetwork.compile
+        networks = [compile(genome, config) for genome in genomes]
+
+        # every layer is padded to the widest version of it in the generation
+        depth = max((len(node_evals) for node_evals in networks), default=0)
+        widths = [max((len(node_evals[l]) for node_evals in networks if l < len(node_evals)), default=0)
+                  for l in range(depth)]
+        zero_slot = num_inputs + sum(widths)
+
+        activation_names = list(ACTIVATIONS)
+        output_slots = np.full((len(networks), len(output_keys)), zero_slot, dtype=np.int64)
+        layers = []
+        first_slot = num_inputs
+        for l, width in enumerate(widths):
+            weights = np.zeros((len(networks), first_slot, width))
+            biases = np.zeros((len(networks), width))
+            responses = np.zeros((len(networks), width))
+            # padded nodes use the identity function and stay 0
+            activations = np.full((len(networks), width), activation_names.index("identity"), dtype=np.int64)
+            layers.append((weights, biases, responses, activations))
+            first_slot += width
+
+        for n, node_evals in enumerate(networks):
+            # inputs keep their positions, hidden and output nodes are placed
+            # in their layer's block of slots
+            slots = dict((key, i) for i, key in enumerate(input_keys))
+            first_slot = num_inputs
+            for l, layer_evals in enumerate(node_evals):
+                weights, biases, responses, activations = layers[l]
+                for j, (node, node_gene, links) in enumerate(layer_evals):
+                    for i, weight in links:
+                        weights[n, slots[i], j] += weight
+                    biases[n, j] = node_gene.bias
+                    responses[n, j] = node_gene.response
+                    activations[n, j] = activation_names.index(node_gene.activation)
+                    slots[node] = first_slot + j
+                first_slot += widths[l]
+            for o, key in enumerate(output_keys):
+                if key in slots:
+                    output_slots[n, o] = slots[key]
+
+        return BatchNetwork(num_inputs, output_slots, layers)
+
+    def activate(self, inputs, rows=None):
+        # inputs holds one row of network inputs per bird, rows says which
+        # network each bird belongs to (all of them, in order, by default)
+        inputs = np.asarray(inputs, dtype=np.float64)
+        if rows is not None:
+            return self.select(rows).activate(inputs)
+        if inputs.shape != (len(self), self.num_inputs):
+            raise RuntimeError("Expected inputs of shape {0}, got {1}".format((len(self), self.num_inputs), inputs.shape))
+
+        values = np.zeros((len(self), self.num_slots))
+        values[:, :self.num_inputs] = inputs
+        first_slot = self.num_inputs
+        for (weights, biases, responses, activations), groups in zip(self.layers, self.groups):
+            width = biases.shape[1]
+            # weighted sum of everything computed so far, per network
+            s = np.matmul(values[:, None, :first_slot], weights)[:, 0, :]
+            z = biases + responses * s
+            layer_values = values[:, first_slot:first_slot + width]
+            for function, using in groups:
+                layer_values[using] = function(z[using])
+            first_slot += width
+
+        return values.reshape(-1)[self.output_indices]
+
+    def jumps(self, inputs, rows=None):
+        # the jump decision of every bird, from its network's first output
+        return self.activate(inputs, rows)[:, 0] > self.JUMP_THRESHOLD
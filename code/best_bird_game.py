@@ -2,67 +2,108 @@ import pygame
 import bird_class
 import pipe_class
 import floor_class
-import os
+import course_class
+import assets
+import renderer_class
+import text_cache_class
 import neat
 import pickle
-
-# initialize pygame
-pygame.init()
+import argparse
 
 # load background image
-BACKGROUND_IMAGE = pygame.transform.scale2x(pygame.image.load(os.path.join("images", "background.png")))
+BACKGROUND_IMAGE = assets.image("background")
 # set game window width
 WINDOW_WIDTH = BACKGROUND_IMAGE.get_width()
 # set game window height
 WINDOW_HEIGHT = BACKGROUND_IMAGE.get_height()
-# set game font: shows score, generation, and number of birds
-FONT = pygame.font.SysFont('aptos', 50)
-
-def draw_game(window, bird, pipes, floor, score):
-    # draw the background image
-    window.blit(BACKGROUND_IMAGE, (0,0))
+# rendered score text, so we only rasterize strings that changed. the font
+# is only opened once, when the first string is drawn
+TEXT = text_cache_class.TextCache(assets.HUD_FONT, 50)
+
+def draw_game(window, bird, pipes, floor, score, renderer=None):
+    # areas of the window drawn over this frame
+    rectangles = []
+    # draw the background image, or only fix up last frame's areas
+    if renderer is None:
+        window.blit(BACKGROUND_IMAGE, (0,0))
+    else:
+        renderer.clear()
 
     # draw all pipes in array
     for pipe in pipes:
-        pipe.draw(window)
+        rectangles.extend(pipe.draw(window))
 
     # grab the score and render it into white text
-    text = FONT.render("Score: " + str(score), 1, (255, 255, 255))
+    text = TEXT.render("Score: " + str(score))
     # place the score text on the top right of the screen
     # if the score gets too large, move it to the left
-    window.blit(text, (WINDOW_WIDTH - 10 - text.get_width(), 10))
+    rectangles.append(window.blit(text, (WINDOW_WIDTH - 10 - text.get_width(), 10)))
     
     # draw the floor
-    floor.draw(window)
+    rectangles.extend(floor.draw(window))
 
-    bird.draw(window)
+    rectangles.append(bird.draw(window))
 
     # update the pygame display with drawn items
-    pygame.display.update()
+    if renderer is None:
+        pygame.display.update()
+    # or push just the areas that changed
+    else:
+        renderer.add(rectangles)
+        renderer.update()
+
+def best_bird_play(seed=None, dirty_rectangles=False):
+    global BACKGROUND_IMAGE
+    # only start the pygame parts a window needs
+    assets.start(display=True)
 
-def best_bird_play():
     # load the best bird
     try:
         with open("best_bird.pkl", "rb") as f:
             best_data = pickle.load(f)
             best_genome = best_data["genome"]
             best_neural_network = best_data["neural_network"]
+            # replay the bird with the decision interval it was trained with
+            # (birds saved before it was recorded decided every frame)
+            decision_interval = best_data.get("decision_interval", 1)
+            # without a seed of our own, fly the course the bird trained on
+            if seed is None:
+                seed = best_data.get("course_seed")
     except FileNotFoundError:
         print("Error: Best bird file not found. Sucks to be you.")
         return
+    if decision_interval < 1:
+        print("Error: Best bird was saved with decision interval {0}, it has to be at least 1.".format(decision_interval))
+        return
 
     bird = bird_class.Bird(230, 350)
     floor = floor_class.Floor(800)
-    pipes = [pipe_class.Pipe(700)]
+    # the pipe course, the training one unless another seed was given
+    course = course_class.Course(seed)
+    pipes = pipe_class.PipePool(course)
+    pipes.add(700)
 
       # display the game window
     window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.DOUBLEBUF | pygame.HWSURFACE)
+    # blit everything, the background included, in the display's pixel
+    # format, which is much faster
+    assets.convert()
+    BACKGROUND_IMAGE = assets.image("background")
     # initialize the score
     score = 0
     # to ensure the game runs at a consistent framerate, set up a clock
     clock = pygame.time.Clock()
+    # the optional renderer that only updates what changed
+    renderer = None
+    if dirty_rectangles:
+        renderer = renderer_class.DirtyRenderer(window, BACKGROUND_IMAGE)
+    # count frames so we know when the bird decides
+    frame = 0
+    # the bird's last jump decision
+    jumping = False
     run = True
     while run:
+        frame += 1
         clock.tick(30)
         # grab external events like keyboard events
         for event in pygame.event.get():
@@ -82,12 +123,15 @@ def best_bird_play():
             pipe_index = 1
 
         bird.move()
-        output = best_neural_network.activate([
-            bird.y,
-            abs(bird.y - pipes[pipe_index].top_pipe_end),
-            abs(bird.y - pipes[pipe_index].bottom_pipe_start)])
+        # only ask the neural network on decision frames
+        if (frame - 1) % decision_interval == 0:
+            output = best_neural_network.activate([
+                bird.y,
+                abs(bird.y - pipes[pipe_index].top_pipe_end),
+                abs(bird.y - pipes[pipe_index].bottom_pipe_start)])
+            jumping = output[0] > 0.5
         
-        if output[0] > 0.5:
+        if jumping:
             bird.jump()
 
         add_pipe = False
@@ -114,7 +158,7 @@ def best_bird_play():
     
         if add_pipe:
             score += 1
-            pipes.append(pipe_class.Pipe(600))
+            pipes.add(600)
         
         for removing_pipe in remove_pipes:
             pipes.remove(removing_pipe)
@@ -125,8 +169,12 @@ def best_bird_play():
             break
 
         floor.move()
-        draw_game(window, bird, pipes, floor, score)
+        draw_game(window, bird, pipes, floor, score, renderer)
 
 # Run the chad
 if __name__ == "__main__":
-    best_bird_play()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Watch the best bird fly")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="fly this pipe course instead of the one the bird trained on")
+    arguments = parser.parse_args()
+    best_bird_play(seed=arguments.seed)
\ No newline at end of file
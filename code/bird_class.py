@@ -1,15 +1,11 @@
 import pygame
-import os
+import assets
 
-# store images of bird
-image_1 = pygame.transform.scale2x(pygame.image.load(os.path.join('images', 'bird1.png')))
-image_2 = pygame.transform.scale2x(pygame.image.load(os.path.join('images', 'bird2.png')))
-image_3 = pygame.transform.scale2x(pygame.image.load(os.path.join('images', 'bird3.png')))
-
-BIRD_IMAGES = [image_1, image_2, image_3]
+# names of the bird images, loaded by the asset registry when first needed
+BIRD_IMAGES = ["bird1", "bird2", "bird3"]
 
 class Bird:
-    # shorter name to store bird images
+    # shorter name to store bird image names
     IMAGES = BIRD_IMAGES
     # max tilt (the most the bird image will angle up)
     MAX_ROTATION = 25
@@ -19,6 +15,10 @@ class Bird:
     ANIMATION_TIME = 5
     # gravity constant
     GRAVITY = 3
+    # rotated bird images, shared by every bird and filled in as new
+    # (wing image, angle) pairs show up. each entry holds the rotated image
+    # and where to draw it relative to the unrotated image's top left corner
+    ROTATION_CACHE = {}
 
     def __init__(self, x, y):
         # horizontal position, stays constant actually
@@ -36,9 +36,10 @@ class Bird:
         # stores frame count to determine which wing position to show
         self.image_count = 0
         # current image of bird
-        self.image = self.IMAGES[0]
+        self.image = assets.image(self.IMAGES[0])
         # mask of bird (an array of 1s and 0s depicting non-transparent pixels)
-        self.bird_mask = pygame.mask.from_surface(self.image)
+        # every bird collides with the first wing image, so they share it
+        self.bird_mask = assets.mask(self.IMAGES[0])
 
 
     def jump(self):
@@ -88,7 +89,7 @@ class Bird:
         # list of 4 wing states
         wing_states = [0, 1, 2, 1]
         # grab the current wing state, that is the image we'll show of the bird
-        self.image = self.IMAGES[wing_states[index]]
+        image_index = wing_states[index]
 
         # restart the frame count of we're repeating the wing animation cycle
         if self.image_count == self.ANIMATION_TIME * 4:
@@ -97,20 +98,34 @@ class Bird:
         # when our bird is falling
         if self.angle <= -80:
             # we don't want the wings to flap
-            self.image = self.IMAGES[1]
+            image_index = 1
             # set the frame count to prepare for the next animation
             self.image_count = self.ANIMATION_TIME*2
+        self.image = assets.image(self.IMAGES[image_index])
+
+        # the angle only takes a handful of values, so each rotation is only
+        # ever computed once
+        key = (image_index, self.angle)
+        if key not in self.ROTATION_CACHE:
+            # using given angle, rotate the image around its topleft corner
+            rotated_image = pygame.transform.rotate(self.image, self.angle)
+            # move both the rectangle and image back to its original center
+            # (the center before the rotation) to achieve a rotation around
+            # its center instead of topleft
+            new_rectangle = rotated_image.get_rect(center=self.image.get_rect().center)
+            self.ROTATION_CACHE[key] = (rotated_image, new_rectangle.topleft)
+        rotated_image, (offset_x, offset_y) = self.ROTATION_CACHE[key]
 
-        # using given angle, rotate the image around its topleft corner
-        rotated_image = pygame.transform.rotate(self.image, self.angle)
-        # move both the rectangle and image back to its original center
-        # (the center before the rotation) to achieve a rotation around its
-        # center instead of topleft
-        new_rectangle = rotated_image.get_rect(center=self.image.get_rect(topleft = (self.x, self.y)).center)
-        # draw the properly rotated image
-        window.blit(rotated_image, new_rectangle.topleft)
+        # draw the properly rotated image, shifted from where the unrotated
+        # image would sit, and hand back the area we drew over
+        top_left = self.image.get_rect(topleft = (self.x, self.y)).topleft
+        return window.blit(rotated_image, (top_left[0] + offset_x, top_left[1] + offset_y))
     
     def get_mask(self):
         # get the bird's mask to enforce pixel perfect collision
         return self.bird_mask
     
+
+# rotations made before the sprites were converted would still be blitted in
+# the old pixel format
+assets.on_convert(Bird.ROTATION_CACHE.clear)
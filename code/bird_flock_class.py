@@ -0,0 +1,53 @@
+class BirdFlock:
+    def __init__(self):
+        # birds controlled by neural networks
+        self.birds = []
+        # the row of the generation's batch network flying each bird, index
+        # matches with the birds
+        self.rows = []
+        # the genome behind each neural network, index matches as well
+        self.genomes = []
+        # the last jump decision of each bird's neural network
+        self.actions = []
+        # which birds are still alive. dead birds stay in the lists until the
+        # next compact, so indices don't shift in the middle of a frame
+        self.alive = []
+        # how many birds died since the last compact
+        self.deaths = 0
+
+    def __len__(self):
+        # number of birds still in the game
+        return len(self.birds) - self.deaths
+
+    def add(self, bird, row, genome):
+        # a new living bird with its brain (a batch network row) and genome
+        self.birds.append(bird)
+        self.rows.append(row)
+        self.genomes.append(genome)
+        self.actions.append(False)
+        self.alive.append(True)
+
+    def kill(self, index):
+        # mark the bird as dead, it's removed at the next compact
+        if self.alive[index]:
+            self.alive[index] = False
+            self.deaths += 1
+
+    def living(self):
+        # (index, bird) for every bird that is still alive. birds killed
+        # while looping are skipped from then on
+        for index, bird in enumerate(self.birds):
+            if self.alive[index]:
+                yield index, bird
+
+    def compact(self):
+        # drop every dead bird in one pass, only if any died
+        if self.deaths == 0:
+            return
+        living = [index for index, alive in enumerate(self.alive) if alive]
+        self.birds = [self.birds[index] for index in living]
+        self.rows = [self.rows[index] for index in living]
+        self.genomes = [self.genomes[index] for index in living]
+        self.actions = [self.actions[index] for index in living]
+        self.alive = [True] * len(living)
+        self.deaths = 0
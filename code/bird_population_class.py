@@ -0,0 +1,78 @@
+import numpy as np
+import assets
+import bird_class
+
+class BirdPopulation:
+    # reuse the single bird's constants so both versions always agree
+    MAX_ROTATION = bird_class.Bird.MAX_ROTATION
+    ROTATIONAL_VELOCITY = bird_class.Bird.ROTATIONAL_VELOCITY
+    GRAVITY = bird_class.Bird.GRAVITY
+    # upward velocity given by a jump
+    JUMP_VELOCITY = -10.5
+    # the bird can't fall faster than this many pixels per frame
+    TERMINAL_DISPLACEMENT = 16
+
+    def __init__(self, size, x, y):
+        # number of birds, dead or alive
+        self.size = size
+        # horizontal position, the same constant for every bird
+        self.x = x
+        # vertical position of every bird
+        self.y = np.full(size, y, dtype=np.float64)
+        # image tilt of every bird
+        self.angle = np.zeros(size, dtype=np.int64)
+        # frames since each bird last jumped
+        self.frame_count = np.zeros(size, dtype=np.int64)
+        # current velocity of every bird
+        self.velocity = np.zeros(size, dtype=np.float64)
+        # the height each bird's last jump started from
+        self.jump_height = np.full(size, y, dtype=np.float64)
+        # which birds are still playing
+        self.alive = np.ones(size, dtype=bool)
+
+    def __len__(self):
+        return self.size
+
+    def alive_count(self):
+        # how many birds are still in the game
+        return int(np.count_nonzero(self.alive))
+
+    def jump(self, jumping):
+        # only living birds can jump
+        jumping = jumping & self.alive
+        # same as Bird.jump, but for every jumping bird at once
+        self.velocity[jumping] = self.JUMP_VELOCITY
+        self.frame_count[jumping] = 0
+        self.jump_height[jumping] = self.y[jumping]
+
+    def move(self):
+        # dead birds stay frozen where they died
+        alive = self.alive
+        frame_count = self.frame_count + 1
+        # same physics formula as Bird.move, evaluated in the same order so
+        # the floating point results are identical
+        displacement = np.minimum(self.velocity * frame_count + 0.5 * self.GRAVITY * frame_count**2,
+                                  self.TERMINAL_DISPLACEMENT)
+        # finetune the jump of birds moving upward
+        displacement = np.where(displacement < 0, displacement - 2, displacement)
+        y = self.y + displacement
+
+        # birds going up (or still above their jump height) tilt upwards
+        tilting_up = (displacement < 0) | (y < self.jump_height - 5)
+        angle = np.where(tilting_up & (self.angle < self.MAX_ROTATION), self.MAX_ROTATION, self.angle)
+        # every other bird nosedives until it looks straight down
+        angle = np.where(~tilting_up & (self.angle > -90), self.angle - self.ROTATIONAL_VELOCITY, angle)
+
+        self.frame_count = np.where(alive, frame_count, self.frame_count)
+        self.y = np.where(alive, y, self.y)
+        self.angle = np.where(alive, angle, self.angle)
+
+    def out_of_bounds(self, floor_y):
+        # every bird image has the same height, so we only need the first
+        height = assets.image(bird_class.BIRD_IMAGES[0]).get_height()
+        # living birds that hit the ground or flew into the sky
+        return self.alive & ((self.y + height > floor_y) | (self.y < 0))
+
+    def kill(self, dying):
+        # take the given birds out of the game
+        self.alive &= ~dying
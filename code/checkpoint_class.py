@@ -0,0 +1,103 @@
+import gzip
+import itertools
+import os
+import pickle
+import queue
+import random
+import threading
+import neat
+
+class AsyncCheckpointer(neat.reporting.BaseReporter):
+    def __init__(self, population, statistics, interval=5, directory="checkpoints"):
+        # the run we keep saving, and its statistics reporter
+        self.population = population
+        self.statistics = statistics
+        # generations between checkpoints
+        self.interval = interval
+        # where the checkpoint files go
+        self.directory = directory
+        # the generation being played right now
+        self.generation = None
+        # snapshots waiting to be written. a single thread writes them, so
+        # the next generation never waits for the disk
+        self.snapshots = queue.Queue()
+        self.writer = threading.Thread(target=self.write_snapshots, daemon=True)
+        self.writer.start()
+
+    def start_generation(self, generation):
+        self.generation = generation
+
+    def end_generation(self, config, population, species_set):
+        # the next generation was just bred, save it before it plays
+        next_generation = self.generation + 1
+        if next_generation % self.interval == 0:
+            self.save(next_generation)
+
+    def save(self, generation):
+        # take the snapshot right now, while nothing is changing it, and leave
+        # compressing and writing it to the background thread
+        population = self.population
+        # the key the next new genome gets. peeking means using one up, so
+        # put a counter starting at that key back
+        next_genome_key = next(population.reproduction.genome_indexer)
+        population.reproduction.genome_indexer = itertools.count(next_genome_key)
+        # same for species keys. the counter itself is left out, newer pythons
+        # can't pickle it
+        next_species_key = next(population.species.indexer)
+        # the species set also points at our reporters (threads and all),
+        # which don't belong in a checkpoint
+        reporters = population.species.reporters
+        population.species.reporters = None
+        population.species.indexer = None
+        try:
+            snapshot = pickle.dumps({
+                "generation": generation,
+                "population": population.population,
+                "species": population.species,
+                "best_genome": population.best_genome,
+                "next_genome_key": next_genome_key,
+                "next_species_key": next_species_key,
+                "random_state": random.getstate(),
+                "statistics": self.statistics,
+            }, protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            population.species.reporters = reporters
+            population.species.indexer = itertools.count(next_species_key)
+        path = os.path.join(self.directory, "neat-checkpoint-{0}".format(generation))
+        self.snapshots.put((path, snapshot))
+
+    def write_snapshots(self):
+        # background thread: write every snapshot to a temporary file first
+        # and rename it into place, so a run killed while writing never
+        # leaves a broken checkpoint behind
+        while True:
+            item = self.snapshots.get()
+            if item is None:
+                break
+            path, snapshot = item
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            temporary_path = path + ".tmp"
+            with open(temporary_path, "wb") as f:
+                f.write(gzip.compress(snapshot, compresslevel=5))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary_path, path)
+            print("Checkpoint saved to", path)
+
+    def close(self):
+        # wait for the checkpoints still being written
+        self.snapshots.put(None)
+        self.writer.join()
+
+def restore(path, config):
+    # a population (and its statistics reporter) that carries on exactly
+    # where the checkpoint was taken
+    with gzip.open(path, "rb") as f:
+        state = pickle.load(f)
+    population = neat.Population(config, (state["population"], state["species"], state["generation"]))
+    population.species.reporters = population.reporters
+    population.species.indexer = itertools.count(state["next_species_key"])
+    population.best_genome = state["best_genome"]
+    population.reproduction.genome_indexer = itertools.count(state["next_genome_key"])
+    random.setstate(state["random_state"])
+    return population, state["statistics"]
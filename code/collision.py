@@ -0,0 +1,85 @@
+import numpy as np
+import assets
+import bird_class
+import pipe_class
+
+# a row without solid pixels gets an interval that can never overlap anything
+EMPTY_ROW = 10**6
+
+def mask_extents(mask):
+    # the leftmost and rightmost solid pixel of every row of a mask. the
+    # overlap test below relies on every row being one solid run of pixels
+    width, height = mask.get_size()
+    left = np.full(height, EMPTY_ROW, dtype=np.int64)
+    right = np.full(height, -EMPTY_ROW, dtype=np.int64)
+    for row in range(height):
+        columns = [column for column in range(width) if mask.get_at((column, row))]
+        if columns:
+            if columns[-1] - columns[0] + 1 != len(columns):
+                raise ValueError("row {0} of the mask has holes in it".format(row))
+            left[row] = columns[0]
+            right[row] = columns[-1]
+    return left, right
+
+# per-row extents of every mask, keyed like the asset registry and computed
+# the first time they're needed
+EXTENTS = {}
+
+def extents(name, flipped=False):
+    # the cached per-row extents of a sprite's mask
+    key = (name, flipped)
+    if key not in EXTENTS:
+        EXTENTS[key] = mask_extents(assets.mask(name, flipped))
+    return EXTENTS[key]
+
+def collide_all(pipes, x, y):
+    # for birds at horizontal position x and vertical positions y (an array),
+    # tell which ones hit any of the pipes. gives exactly the same answer as
+    # calling Pipe.collide on every bird and pipe, and counts the checks
+    # the same way in Pipe's collision counters
+    hit = np.zeros(len(y), dtype=bool)
+    bird_width, bird_height = assets.mask(bird_class.BIRD_IMAGES[0]).get_size()
+    pipe_width = assets.mask(pipe_class.PIPE_IMAGE).get_size()[0]
+    # no bird can touch a pipe that isn't in the birds' column, which is
+    # most pipes most of the time
+    near_pipes = []
+    for pipe in pipes:
+        if pipe.x > x + bird_width - 1 or pipe.x + pipe_width - 1 < x:
+            pipe_class.Pipe.x_rejects += len(y)
+        else:
+            near_pipes.append(pipe)
+    if not near_pipes:
+        return hit
+
+    # round the bird positions the same way Pipe.collide does
+    y = np.round(np.asarray(y, dtype=np.float64)).astype(np.int64)
+    # every bird collides with its first wing image
+    bird_left, bird_right = extents(bird_class.BIRD_IMAGES[0])
+    top_pipe_left, top_pipe_right = extents(pipe_class.PIPE_IMAGE, flipped=True)
+    bottom_pipe_left, bottom_pipe_right = extents(pipe_class.PIPE_IMAGE)
+    # the solid part of each bird row on screen
+    bird_left = x + bird_left
+    bird_right = x + bird_right
+
+    for pipe in near_pipes:
+        # birds completely inside the gap can't hit either pipe
+        checking = np.flatnonzero((y < pipe.top_pipe_end) | (y + bird_height > pipe.bottom_pipe_start))
+        pipe_class.Pipe.gap_rejects += len(y) - len(checking)
+        pipe_class.Pipe.mask_checks += len(checking)
+        if len(checking) == 0:
+            continue
+        # the screen row of every bird row, one line per bird left to check
+        rows = y[checking, None] + np.arange(bird_height)
+        for pipe_start, pipe_left, pipe_right in ((pipe.top_pipe_start, top_pipe_left, top_pipe_right),
+                                                  (pipe.bottom_pipe_start, bottom_pipe_left, bottom_pipe_right)):
+            # which row of the pipe every bird row lines up with
+            pipe_rows = rows - pipe_start
+            inside = (pipe_rows >= 0) & (pipe_rows < len(pipe_left))
+            pipe_rows = np.minimum(np.maximum(pipe_rows, 0), len(pipe_left) - 1)
+            # two solid runs on the same row overlap if their intersection
+            # isn't empty
+            overlap_left = np.maximum(bird_left, pipe.x + pipe_left[pipe_rows])
+            overlap_right = np.minimum(bird_right, pipe.x + pipe_right[pipe_rows])
+            hit[checking] |= (inside & (overlap_left <= overlap_right)).any(axis=1)
+
+    return hit
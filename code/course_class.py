@@ -0,0 +1,42 @@
+import random
+import pipe_class
+
+class Course:
+    # the highest the pipes can be
+    MIN_PIPE_HEIGHT = pipe_class.Pipe.MIN_PIPE_HEIGHT
+    # the lowest the pipes can be
+    MAX_PIPE_HEIGHT = pipe_class.Pipe.MAX_PIPE_HEIGHT
+
+    def __init__(self, seed=None, length=0):
+        # without a seed we still pick one, so any course can be replayed
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.seed = seed
+        # the course's own random generator, untouched by anything else
+        self.random = random.Random(seed)
+        # every top_pipe_end generated so far, in order
+        self.heights = []
+        # index of the next pipe handed out by next_height
+        self.position = 0
+        # generate the first pipes in advance if asked to
+        self.generate(length)
+
+    def generate(self, length):
+        # make sure at least "length" pipes exist
+        while len(self.heights) < length:
+            self.heights.append(self.random.randrange(self.MIN_PIPE_HEIGHT, self.MAX_PIPE_HEIGHT))
+
+    def __getitem__(self, index):
+        # the top_pipe_end of the index-th pipe, generated lazily
+        self.generate(index + 1)
+        return self.heights[index]
+
+    def next_height(self):
+        # hand out the next pipe of the course
+        height = self[self.position]
+        self.position += 1
+        return height
+
+    def reset(self):
+        # start the same course again from its first pipe
+        self.position = 0
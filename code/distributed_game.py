@@ -0,0 +1,203 @@
+import asyncio
+import json
+import random
+import struct
+import argparse
+import neat
+import parallel_game
+
+# every message is a 4 byte length followed by that much JSON
+HEADER = struct.Struct(">I")
+# default port the coordinator listens on
+PORT = 5005
+
+def write_message(writer, message):
+    # queue a message on a stream, the caller drains it
+    data = json.dumps(message).encode()
+    writer.write(HEADER.pack(len(data)) + data)
+
+async def read_message(reader):
+    # wait for the next whole message on a stream
+    header = await reader.readexactly(HEADER.size)
+    data = await reader.readexactly(HEADER.unpack(header)[0])
+    return json.loads(data)
+
+def network_payload(genome, config):
+    # the compiled neural network of a genome as plain lists, which is all a
+    # worker needs to fly the bird: input and output keys, then every node
+    # in evaluation order with its activation and aggregation by name
+    neural_network = neat.nn.FeedForwardNetwork.create(genome, config)
+    node_evals = [[node, genome.nodes[node].activation, genome.nodes[node].aggregation,
+                   bias, response, links]
+                  for node, _, _, bias, response, links in neural_network.node_evals]
+    return [neural_network.input_nodes, neural_network.output_nodes, node_evals]
+
+# the functions a worker looks node activations and aggregations up in
+ACTIVATIONS = neat.activations.ActivationFunctionSet()
+AGGREGATIONS = neat.aggregations.AggregationFunctionSet()
+
+def network_from_payload(payload):
+    # build the neural network network_payload described
+    inputs, outputs, node_evals = payload
+    node_evals = [(node, ACTIVATIONS.get(activation), AGGREGATIONS.get(aggregation),
+                   bias, response, [tuple(link) for link in links])
+                  for node, activation, aggregation, bias, response, links in node_evals]
+    return neat.nn.FeedForwardNetwork(inputs, outputs, node_evals)
+
+def play_batch(message):
+    # play every neural network of a batch, one after another
+    return [parallel_game.play_network(network_from_payload(payload), message["seed"],
+                                       message["decision_interval"])
+            for payload in message["networks"]]
+
+async def work(host, port):
+    # worker: play every batch the coordinator sends until it hangs up. the
+    # games run in a thread so the next batches can already arrive while
+    # one is being played
+    reader, writer = await asyncio.open_connection(host, port)
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                message = await read_message(reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                # the coordinator is done with us
+                break
+            fitnesses = await loop.run_in_executor(None, play_batch, message)
+            write_message(writer, {"id": message["id"], "fitnesses": fitnesses})
+            await writer.drain()
+    finally:
+        writer.close()
+
+class Coordinator:
+    def __init__(self, host="127.0.0.1", port=PORT, batch_size=8, pipeline=2,
+                 timeout=60.0, seed=None, decision_interval=1):
+        # genomes sent to a worker per message
+        self.batch_size = batch_size
+        # batches a worker may have waiting for it at once, so it never
+        # sits idle while its next batch is on the way
+        self.pipeline = pipeline
+        # seconds a worker gets to answer before its batches go to the others
+        self.timeout = timeout
+        # course seed for every generation (None picks a new one each time)
+        self.seed = seed
+        # frames between the neural network's jump decisions
+        self.decision_interval = decision_interval
+        # connected workers as (reader, writer), and the tasks feeding them
+        self.workers = []
+        self.tasks = []
+        # the generation being evaluated, None between generations
+        self.generation = None
+        # the event loop only runs while a generation is evaluated, workers
+        # that connect in between are picked up once it runs again
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(
+            asyncio.start_server(self.connect, host, port))
+
+    async def connect(self, reader, writer):
+        # a new worker joined, put it to work right away if a generation is on
+        worker = (reader, writer)
+        self.workers.append(worker)
+        if self.generation is not None:
+            self.tasks.append(asyncio.create_task(self.feed(worker)))
+
+    def send(self, writer, batch_id):
+        # send one batch of networks to a worker
+        generation = self.generation
+        write_message(writer, {"id": batch_id, "seed": generation["seed"],
+                               "decision_interval": self.decision_interval,
+                               "networks": generation["payloads"][batch_id]})
+
+    async def feed(self, worker):
+        # keep one worker busy until the generation is done
+        reader, writer = worker
+        generation = self.generation
+        queue = generation["queue"]
+        # batches sent to this worker and not answered yet
+        in_flight = set()
+        try:
+            while True:
+                # with nothing to do, wait for a batch (which may be one
+                # another worker failed to finish)
+                if not in_flight:
+                    batch_id = await queue.get()
+                    self.send(writer, batch_id)
+                    in_flight.add(batch_id)
+                # top the worker's pipeline up
+                while len(in_flight) < self.pipeline and not queue.empty():
+                    batch_id = queue.get_nowait()
+                    self.send(writer, batch_id)
+                    in_flight.add(batch_id)
+                await writer.drain()
+
+                reply = await asyncio.wait_for(read_message(reader), self.timeout)
+                batch_id = reply["id"]
+                in_flight.discard(batch_id)
+                generation["results"][batch_id] = reply["fitnesses"]
+                if len(generation["results"]) == len(generation["batches"]):
+                    generation["finished"].set()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, OSError, ValueError, KeyError):
+            # the worker died, hung or sent garbage. drop it and hand its
+            # batches to the other workers
+            for batch_id in in_flight:
+                queue.put_nowait(batch_id)
+            self.workers.remove(worker)
+            writer.close()
+
+    async def evaluate_batches(self):
+        # feed every worker until every batch has a result
+        self.tasks = [asyncio.create_task(self.feed(worker)) for worker in self.workers]
+        if not self.workers:
+            print("Waiting for workers to connect...")
+        await self.generation["finished"].wait()
+        # the workers left are all waiting for more batches
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    def evaluate(self, genomes, config):
+        # pass this to population.run in place of neat_game.main
+        seed = self.seed if self.seed is not None else random.randrange(2**32)
+        genome_objects = [genome for genome_id, genome in genomes]
+        batches = [genome_objects[i:i + self.batch_size]
+                   for i in range(0, len(genome_objects), self.batch_size)]
+        queue = asyncio.Queue()
+        for batch_id in range(len(batches)):
+            queue.put_nowait(batch_id)
+        self.generation = {
+            "seed": seed,
+            "batches": batches,
+            "payloads": [[network_payload(genome, config) for genome in batch] for batch in batches],
+            "queue": queue,
+            "results": {},
+            "finished": asyncio.Event(),
+        }
+        try:
+            self.loop.run_until_complete(self.evaluate_batches())
+        finally:
+            generation = self.generation
+            self.generation = None
+
+        # put the fitness values back into the genomes
+        for batch_id, batch in enumerate(batches):
+            for genome, fitness in zip(batch, generation["results"][batch_id]):
+                genome.fitness = fitness
+
+    def close(self):
+        # hang up on every worker, which makes them exit, and stop listening
+        for reader, writer in self.workers:
+            writer.close()
+        self.server.close()
+        self.loop.run_until_complete(self.server.wait_closed())
+        self.loop.close()
+
+if __name__ == "__main__":
+    # start a worker that plays genomes for a coordinator (neat_game --serve)
+    parser = argparse.ArgumentParser(description="Play genomes for a NEAT coordinator")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address of the coordinator")
+    parser.add_argument("--port", type=int, default=PORT,
+                        help="port the coordinator listens on")
+    arguments = parser.parse_args()
+    asyncio.run(work(arguments.host, arguments.port))
@@ -0,0 +1,60 @@
+import os
+import pickle
+import network_cache_class
+
+class FitnessMemo:
+    def __init__(self, file_path=None):
+        # where the memo is kept between runs, None keeps it in memory only
+        self.file_path = file_path
+        # fitness by (genome hash, course seed, evaluation settings)
+        self.fitnesses = {}
+        if file_path is not None and os.path.exists(file_path):
+            with open(file_path, "rb") as f:
+                self.fitnesses = pickle.load(f)
+        # genomes whose fitness we already knew, and genomes that had to play
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.fitnesses)
+
+    def reset_counts(self):
+        # start counting hits and misses from zero (every generation)
+        self.hits = 0
+        self.misses = 0
+
+    def counts(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def key(self, genome, seed, settings):
+        # a genome always gets the same fitness on the same seeded course
+        # with the same settings (the decision interval, for example)
+        return (network_cache_class.genome_hash(genome), seed, settings)
+
+    def get(self, genome, seed, settings):
+        # the genome's fitness if it was played before, otherwise None.
+        # courses without a seed are different every time, so never known
+        if seed is None:
+            self.misses += 1
+            return None
+        fitness = self.fitnesses.get(self.key(genome, seed, settings))
+        if fitness is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return fitness
+
+    def put(self, genome, seed, settings, fitness):
+        # remember the fitness a genome got on a seeded course
+        if seed is not None:
+            self.fitnesses[self.key(genome, seed, settings)] = fitness
+
+    def save(self):
+        # write the memo to disk, through a temporary file so a run that
+        # gets killed halfway never leaves a broken memo behind
+        if self.file_path is None:
+            return
+        temporary_path = self.file_path + ".tmp"
+        with open(temporary_path, "wb") as f:
+            pickle.dump(self.fitnesses, f)
+        os.replace(temporary_path, self.file_path)
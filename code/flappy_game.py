@@ -2,46 +2,69 @@ import pygame
 import bird_class
 import pipe_class
 import floor_class
-import os
-
-# Initialize Pygame
-pygame.init()
+import course_class
+import assets
+import renderer_class
+import text_cache_class
+import argparse
 
 # Load Background Image
-BACKGROUND_IMAGE = pygame.transform.scale2x(pygame.image.load(os.path.join("images", "background.png")))
+BACKGROUND_IMAGE = assets.image("background")
 WINDOW_WIDTH = BACKGROUND_IMAGE.get_width()
 WINDOW_HEIGHT = BACKGROUND_IMAGE.get_height()
-FONT = pygame.font.SysFont('aptos', 50)
+TEXT = text_cache_class.TextCache(assets.HUD_FONT, 50)
 
 # Function to Draw the Game
-def draw_game(window, bird, pipes, floor, score):
-    window.blit(BACKGROUND_IMAGE, (0,0))
+def draw_game(window, bird, pipes, floor, score, renderer=None):
+    # Background (or just last frame's areas with a renderer)
+    rectangles = []
+    if renderer is None:
+        window.blit(BACKGROUND_IMAGE, (0,0))
+    else:
+        renderer.clear()
 
     # Draw Pipes
     for pipe in pipes:
-        pipe.draw(window)
+        rectangles.extend(pipe.draw(window))
 
     # Display Score
-    text = FONT.render(f"Score: {score}", 1, (255, 255, 255))
-    window.blit(text, (WINDOW_WIDTH - 10 - text.get_width(), 10))
+    text = TEXT.render(f"Score: {score}")
+    rectangles.append(window.blit(text, (WINDOW_WIDTH - 10 - text.get_width(), 10)))
 
     # Draw Floor and Bird
-    floor.draw(window)
-    bird.draw(window)
+    rectangles.extend(floor.draw(window))
+    rectangles.append(bird.draw(window))
 
-    pygame.display.update()
+    # Push the Whole Window, or Only What Changed
+    if renderer is None:
+        pygame.display.update()
+    else:
+        renderer.add(rectangles)
+        renderer.update()
 
 # Function for Player to Play the Game
-def play_game():
-    # Initialize Bird, Floor, and Pipes
+def play_game(seed=None, dirty_rectangles=False):
+    global BACKGROUND_IMAGE
+    # Start Only the Display and Font Parts of Pygame
+    assets.start(display=True)
+
+    # Initialize Bird, Floor, Course, and Pipes
     bird = bird_class.Bird(230, 350)
     floor = floor_class.Floor(800)
-    pipes = [pipe_class.Pipe(700)]
+    course = course_class.Course(seed)
+    pipes = pipe_class.PipePool(course)
+    pipes.add(700)
 
     # Display Game Window
     window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.DOUBLEBUF | pygame.HWSURFACE)
+    # Blit Everything, Background Included, in the Display's Pixel Format
+    assets.convert()
+    BACKGROUND_IMAGE = assets.image("background")
     score = 0
     clock = pygame.time.Clock()
+    renderer = None
+    if dirty_rectangles:
+        renderer = renderer_class.DirtyRenderer(window, BACKGROUND_IMAGE)
     run = True
 
     while run:
@@ -85,7 +108,7 @@ def play_game():
 
         if add_pipe:
             score += 1
-            pipes.append(pipe_class.Pipe(600))
+            pipes.add(600)
 
         for pipe in remove_pipes:
             pipes.remove(pipe)
@@ -96,8 +119,12 @@ def play_game():
             break
 
         floor.move()
-        draw_game(window, bird, pipes, floor, score)
+        draw_game(window, bird, pipes, floor, score, renderer)
 
 # Run the Player Game
 if __name__ == "__main__":
-    play_game()
+    parser = argparse.ArgumentParser(description="Play flappy bird")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="fly this pipe course, e.g. the --seed a NEAT run trained on")
+    arguments = parser.parse_args()
+    play_game(seed=arguments.seed)
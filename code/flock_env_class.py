@@ -0,0 +1,116 @@
+import numpy as np
+import bird_population_class
+import pipe_class
+import course_class
+import collision
+import parallel_game
+
+class FlockEnv:
+    # a whole flock of birds flying one course in lockstep, with a gym-like
+    # reset/step interface. it is not a vector of independent games: every
+    # game shares the one course, its pipes and the score, and a finished
+    # game stays finished (there is no per-game reset) until reset() starts
+    # them all over. fewer games are left playing as birds die, which is
+    # exactly what evaluating a generation on one course needs
+    # every game ends once its bird reaches this score
+    MAX_SCORE = parallel_game.MAX_SCORE
+    # birds die if they go below the floor
+    FLOOR_Y = parallel_game.FLOOR_Y
+    # where every bird starts
+    BIRD_X = 230
+    BIRD_Y = 350
+    # rewards, the same amounts the birds get as fitness in neat_game
+    FRAME_REWARD = 0.1
+    PIPE_REWARD = 5
+    CRASH_PENALTY = -1
+
+    def __init__(self, num_games):
+        # number of games played side by side, one bird each
+        self.num_games = num_games
+        self.birds = None
+        self.pipes = None
+        self.score = 0
+
+    def __len__(self):
+        return self.num_games
+
+    def reset(self, seed=None):
+        # start every game over on the course with the given seed (None picks
+        # a random one) and return the first observations. the pipes only
+        # depend on the course and on time, never on the birds, so every
+        # game can share one set of pipes
+        self.course = course_class.Course(seed)
+        self.birds = bird_population_class.BirdPopulation(self.num_games, self.BIRD_X, self.BIRD_Y)
+        self.pipes = pipe_class.PipePool(self.course)
+        self.pipes.add(700)
+        self.score = 0
+        # the first frame starts by moving the birds, same as the game loop
+        self.birds.move()
+        return self.observations()
+
+    def pipe_index(self):
+        # the pipe the birds should be looking at, the second one once the
+        # birds are past the first
+        pipes = self.pipes
+        if len(pipes) > 1 and self.BIRD_X > pipes[0].x + pipes[0].top_pipe_image.get_width():
+            return 1
+        return 0
+
+    def observations(self):
+        # the same inputs the neural networks get: every bird's y position
+        # and its vertical distance to the top and bottom pipe of the gap
+        pipe = self.pipes[self.pipe_index()]
+        y = self.birds.y
+        return np.stack([y, np.abs(y - pipe.top_pipe_end), np.abs(y - pipe.bottom_pipe_start)], axis=1)
+
+    def dones(self):
+        # games whose bird is gone
+        return ~self.birds.alive
+
+    def step(self, actions):
+        # play one frame of every game. actions tells which birds jump.
+        # returns (observations, rewards, dones, info) as numpy arrays, like
+        # gym's step. finished games stay finished (with no more rewards)
+        # until the next reset
+        birds = self.birds
+        playing = birds.alive.copy()
+        # every game still going gets the reward for the frame it moved in
+        rewards = np.where(playing, self.FRAME_REWARD, 0.0)
+        birds.jump(np.asarray(actions, dtype=bool))
+
+        # crashing into a pipe costs a point and ends the game
+        crashed = playing & collision.collide_all(self.pipes, self.BIRD_X, birds.y)
+        rewards[crashed] += self.CRASH_PENALTY
+        birds.kill(crashed)
+
+        # move the pipes, same order as the game loop
+        add_pipe = False
+        remove_pipes = []
+        for pipe in self.pipes:
+            if not pipe.passed and pipe.x < self.BIRD_X:
+                pipe.passed = True
+                add_pipe = True
+            if pipe.x + pipe.top_pipe_image.get_width() < 0:
+                remove_pipes.append(pipe)
+            pipe.move()
+
+        # every bird still playing made it through the pipe
+        if add_pipe:
+            self.score += 1
+            rewards[birds.alive] += self.PIPE_REWARD
+            self.pipes.add(600)
+
+        # a perfect score ends every game that's left
+        if self.score >= self.MAX_SCORE:
+            birds.kill(birds.alive.copy())
+
+        for removing_pipe in remove_pipes:
+            self.pipes.remove(removing_pipe)
+
+        # hitting the ground or flying into the sky ends the game
+        birds.kill(birds.out_of_bounds(self.FLOOR_Y))
+
+        # the next frame starts by moving the birds that are left
+        if birds.alive.any():
+            birds.move()
+        return self.observations(), rewards, self.dones(), {"score": self.score}
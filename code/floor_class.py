@@ -1,23 +1,21 @@
-import pygame
-import os
+import assets
 
-FLOOR_IMAGE = pygame.transform.scale2x(pygame.image.load(os.path.join("images", "floor.png")))
+# name of the floor image, loaded by the asset registry when first needed
+FLOOR_IMAGE = "floor"
 
 class Floor:
     # the floors must move so the bird looks like it's moving
     VELOCITY = 5
-    # get the floor width using the image size
-    WIDTH = FLOOR_IMAGE.get_width()
-    # now grab the actual image
-    IMAGE = FLOOR_IMAGE
 
     def __init__(self, y):
         # vertical position of the floor
         self.y = y
+        # get the floor width using the image size
+        self.width = assets.image(FLOOR_IMAGE).get_width()
         # horizontal position of the first floor segment
         self.floor1_x = 0
         # horizontal position of the second floor segment
-        self.floor2_x = self.WIDTH
+        self.floor2_x = self.width
 
     def move(self):
         # make both floor segments move to the left
@@ -25,16 +23,20 @@ class Floor:
         self.floor2_x -= self.VELOCITY
 
         # if floor1 reached the end of the screen
-        if self.floor1_x + self.WIDTH < 0:
+        if self.floor1_x + self.width < 0:
             # move it behind floor2
-            self.floor1_x = self.floor2_x + self.WIDTH
+            self.floor1_x = self.floor2_x + self.width
         # if floor2 reaches the end of the screen
-        if self.floor2_x + self.WIDTH < 0:
+        if self.floor2_x + self.width < 0:
             # move it behind floor1
-            self.floor2_x = self.floor1_x + self.WIDTH
+            self.floor2_x = self.floor1_x + self.width
     
     def draw(self, window):
+        # now grab the actual image
+        image = assets.image(FLOOR_IMAGE)
         # draw floor1
-        window.blit(self.IMAGE, (self.floor1_x, self.y))
+        floor1_rectangle = window.blit(image, (self.floor1_x, self.y))
         # draw floor2
-        window.blit(self.IMAGE, (self.floor2_x, self.y))
\ No newline at end of file
+        floor2_rectangle = window.blit(image, (self.floor2_x, self.y))
+        # the areas of the window we drew over
+        return [floor1_rectangle, floor2_rectangle]
@@ -0,0 +1,165 @@
+import copy
+import heapq
+import os
+import random
+import neat
+import parallel_game
+import network_cache_class
+from multiprocessing import Process, Pipe
+
+# how many of the best genomes ever seen on any island we keep
+HALL_OF_FAME_SIZE = 10
+# which islands send their migrants to which
+TOPOLOGIES = ("ring", "all")
+
+class MigrationReporter(neat.reporting.BaseReporter):
+    def __init__(self, migrants):
+        # number of genomes this island sends away
+        self.migrants = migrants
+        # the fittest genomes of the last evaluated generation
+        self.top = []
+        # genomes of the last evaluated generation. the elites among them
+        # are carried over into the next one, which migrants must not replace
+        self.evaluated = set()
+
+    def post_evaluate(self, config, population, species, best_genome):
+        # remember who did best, as copies so breeding can't touch them
+        self.top = [copy.deepcopy(genome) for genome in
+                    heapq.nlargest(self.migrants, population.values(), key=lambda genome: genome.fitness)]
+        self.evaluated = set(population)
+
+def settle(population, immigrants, reporter):
+    # swap some freshly bred genomes for the immigrants and sort everyone
+    # into species again. elites carried over from the last generation stay
+    replaceable = [key for key in population.population if key not in reporter.evaluated]
+    for immigrant, old_key in zip(immigrants, random.sample(replaceable, min(len(immigrants), len(replaceable)))):
+        del population.population[old_key]
+        # a new key from this island, so it can't clash with a local genome
+        immigrant.key = next(population.reproduction.genome_indexer)
+        immigrant.fitness = None
+        population.reproduction.ancestors[immigrant.key] = tuple()
+        population.population[immigrant.key] = immigrant
+    if immigrants:
+        population.species.speciate(population.config, population.population, population.generation)
+
+def run_island(island, configuration_file_path, connection, seed, course_seed,
+               decision_interval, migrants):
+    # island process entry point: evolve a population of our own, and only
+    # talk to the others (through the main process) between epochs
+    random.seed(seed)
+    config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                configuration_file_path)
+    population = neat.Population(config)
+    reporter = MigrationReporter(migrants)
+    population.add_reporter(reporter)
+
+    def evaluate(genomes, config):
+        # play every genome headless, on the given course or a new one
+        # every generation
+        seed = course_seed if course_seed is not None else random.randrange(2**32)
+        for genome_id, genome in genomes:
+            genome.fitness = parallel_game.play_genome(genome, config, seed, decision_interval)
+
+    while True:
+        message = connection.recv()
+        # None means the run is over
+        if message is None:
+            break
+        generations, immigrants = message
+        settle(population, immigrants, reporter)
+        population.run(evaluate, generations)
+        connection.send((reporter.top, population.generation, population.best_genome))
+    connection.close()
+
+def destinations(island, islands, topology):
+    # the islands an island's migrants go to, never the island itself (a
+    # single island has nobody to send them to)
+    if topology == "ring":
+        return [(island + 1) % islands] if islands > 1 else []
+    return [other for other in range(islands) if other != island]
+
+def run_islands(configuration_file_path, islands, generations=50, migrate_every=5,
+                migrants=2, topology="ring", seed=None, decision_interval=1):
+    # evolve one population per process, moving the best genomes between
+    # them every migrate_every generations. returns the hall of fame, the
+    # best genomes found on any island, best first
+    if topology not in TOPOLOGIES:
+        raise ValueError("unknown topology {0!r}, pick one of {1}".format(topology, TOPOLOGIES))
+    if islands < 1:
+        raise ValueError("islands must be at least 1, got {0}".format(islands))
+    # every epoch has to play at least one generation, or the islands come
+    # back without a best genome
+    if migrate_every < 1:
+        raise ValueError("migrate_every must be at least 1, got {0}".format(migrate_every))
+    config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                configuration_file_path)
+    # every island needs its own random numbers, or they'd all evolve alike
+    base_seed = int.from_bytes(os.urandom(4), "big")
+    connections = []
+    processes = []
+    for island in range(islands):
+        connection, island_connection = Pipe()
+        process = Process(target=run_island,
+                          args=(island, configuration_file_path, island_connection,
+                                base_seed + island, seed, decision_interval, migrants),
+                          daemon=True)
+        process.start()
+        # the island has its end of the pipe now. closing ours means a dead
+        # island shows up as EOFError instead of a recv that never returns
+        island_connection.close()
+        connections.append(connection)
+        processes.append(process)
+
+    # best genomes ever seen, by genome hash so the same genome coming back
+    # from several islands is only listed once
+    hall_of_fame = {}
+    immigrants = [[] for island in range(islands)]
+    done = 0
+    try:
+        while done < generations:
+            epoch = min(migrate_every, generations - done)
+            for island, connection in enumerate(connections):
+                try:
+                    connection.send((epoch, immigrants[island]))
+                except OSError:
+                    raise RuntimeError("island {0} died".format(island)) from None
+            done += epoch
+
+            immigrants = [[] for island in range(islands)]
+            solved = False
+            for island, connection in enumerate(connections):
+                try:
+                    top, generation, best_genome = connection.recv()
+                except (EOFError, OSError):
+                    # the island's own traceback was already printed by its process
+                    raise RuntimeError("island {0} died".format(island)) from None
+                print("Island {0}: generation {1}, best fitness {2:.1f}".format(island, generation, best_genome.fitness))
+                for genome in top + [best_genome]:
+                    hall_of_fame[network_cache_class.genome_hash(genome)] = genome
+                for other in destinations(island, islands, topology):
+                    immigrants[other].extend(top)
+                if best_genome.fitness >= config.fitness_threshold:
+                    solved = True
+            hall_of_fame = dict(heapq.nlargest(HALL_OF_FAME_SIZE, hall_of_fame.items(),
+                                               key=lambda item: item[1].fitness))
+            # one island finding a perfect bird ends the whole run
+            if solved:
+                break
+    finally:
+        # tell the islands still alive to stop, then wait for them. one that
+        # doesn't stop in time (it's still playing after an error) is killed
+        for connection in connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            connection.close()
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+    return sorted(hall_of_fame.values(), key=lambda genome: genome.fitness, reverse=True)
@@ -1,125 +1,235 @@
+import time
+# when this module started loading, for the startup timing report
+START_TIME = time.perf_counter()
 import pygame
 import bird_class
 import pipe_class
 import floor_class
+import course_class
+import bird_flock_class
+import assets
 import os
 import neat
 import pickle
+import argparse
+import heapq
+import collision
+import numpy as np
+import parallel_game
+import distributed_game
+import island_game
+import steady_state_game
+import checkpoint_class
+import renderer_class
+import text_cache_class
+import batch_network_class
+import network_cache_class
+import fitness_memo_class
 
-# initialize pygame
-pygame.init()
-
-# load background image
-BACKGROUND_IMAGE = pygame.transform.scale2x(pygame.image.load(os.path.join("images", "background.png")))
-# set game window width
-WINDOW_WIDTH = BACKGROUND_IMAGE.get_width()
-# set game window height
-WINDOW_HEIGHT = BACKGROUND_IMAGE.get_height()
-# set game font: shows score, generation, and number of birds
-FONT = pygame.font.SysFont('aptos', 50)
+# background image, only loaded once a window needs it (the game window is
+# the size of the background)
+BACKGROUND_IMAGE = "background"
+# rendered HUD text (score, generation, and number of birds), so we only
+# rasterize strings that changed. the font is only opened once a window
+# draws text
+TEXT = text_cache_class.TextCache(assets.HUD_FONT, 50)
+# the game window, and the optional renderer that only updates what
+# changed. both are made once by open_window and kept for every generation
+WINDOW = None
+RENDERER = None
 # set current generation
 GENERATION = 0
+# when True, the generation runs without a window: no frame cap, no event
+# polling and no drawing, so it goes as fast as the CPU allows
+HEADLESS = False
+# seed of the pipe course every generation flies through. None gives each
+# generation a new random course
+COURSE_SEED = None
+# print how each generation's collision checks were settled
+COLLISION_STATS = False
+# redraw and push only the parts of the window that changed
+DIRTY_RECTANGLES = False
+# only draw every this many simulated frames, the rest run uncapped
+RENDER_EVERY = 1
+# only draw this many of the most promising birds (None draws all of them)
+SPECTATE_TOP = None
+# what every genome scored last generation, and every genome's parents. the
+# birds alive in a generation all have the same fitness so far, so
+# SPECTATE_TOP picks the ones whose genome (or its parents) did best before
+LAST_FITNESS = {}
+ANCESTORS = {}
+# print how long imports and the first frame took
+TIMING = False
+# the neural networks only decide every this many frames, and the birds
+# repeat their last decision in between
+DECISION_INTERVAL = 1
+# compiled neural networks of recent genomes by genome key, so the elites
+# that come back next generation don't have to be compiled again
+NETWORKS = network_cache_class.NetworkCache(batch_network_class.BatchNetwork.compile)
+# fitness of genomes already played on the seeded course, so they don't
+# have to play again. None plays every genome
+FITNESS_MEMO = None
+# seconds from the start of the imports to the end of the first frame
+FIRST_FRAME_TIME = None
+# how long it took to import everything above
+IMPORT_TIME = time.perf_counter() - START_TIME
 
 # save the best bird
 def save_best_bird(genome, neural_network):
     best_bird_data = {
         "genome": genome,
-        "neural_network": neural_network
+        "neural_network": neural_network,
+        # the bird has to be replayed with the same decision interval
+        "decision_interval": DECISION_INTERVAL,
+        # and on the course it trained on (None if every generation got a
+        # new one)
+        "course_seed": COURSE_SEED
     }
     with open("best_bird.pkl", "wb") as f:
         pickle.dump(best_bird_data, f)
     print("Best bird saved successfully!")
 
-def draw_game(window, birds, pipes, floor, score, generation, num_birds):
-    # draw the background image
-    window.blit(BACKGROUND_IMAGE, (0,0))
+def draw_game(window, birds, pipes, floor, score, generation, num_birds, renderer=None):
+    # areas of the window drawn over this frame
+    rectangles = []
+    # draw the background image, or only fix up last frame's areas
+    if renderer is None:
+        window.blit(assets.image(BACKGROUND_IMAGE), (0,0))
+    else:
+        renderer.clear()
 
     # draw all pipes in array
     for pipe in pipes:
-        pipe.draw(window)
+        rectangles.extend(pipe.draw(window))
 
     # grab the score and render it into white text
-    text = FONT.render("Score: " + str(score), 1, (255, 255, 255))
+    text = TEXT.render("Score: " + str(score))
     # place the score text on the top right of the screen
     # if the score gets too large, move it to the left
-    window.blit(text, (WINDOW_WIDTH - 10 - text.get_width(), 10))
+    rectangles.append(window.blit(text, (window.get_width() - 10 - text.get_width(), 10)))
     # print the current generation on the screen
-    text = FONT.render("Generation: " + str(generation), 1, (255, 255, 255))
-    window.blit(text, (10, 10))
-    # print the current number of surviving birds
-    text = FONT.render("Birds: " + str(num_birds), 1, (255, 255, 255))
-    window.blit(text, (10, 50))
+    text = TEXT.render("Generation: " + str(generation))
+    rectangles.append(window.blit(text, (10, 10)))
+    # print the current number of surviving birds, it changes all the time
+    # so it's put together from cached digits
+    rectangles.append(TEXT.blit_number(window, "Birds: ", num_birds, (10, 50)))
     
     # draw the floor
-    floor.draw(window)
+    rectangles.extend(floor.draw(window))
 
     # draw all birds in array
     for bird in birds:
-        bird.draw(window)
+        rectangles.append(bird.draw(window))
 
     # update the pygame display with drawn items
-    pygame.display.update()
+    if renderer is None:
+        pygame.display.update()
+    # or push just the areas that changed
+    else:
+        renderer.add(rectangles)
+        renderer.update()
 
 def main(genomes, config):
     # grab the current generation
-    global GENERATION
+    global GENERATION, FIRST_FRAME_TIME, LAST_FITNESS
     # each time this function runs, we are in a new generation
     GENERATION += 1
-    # list of active neural networks
-    neural_networks = []
-    # list of corresponding genomes, index matches with the neural networks
-    genome_list = []
-    # list of birds controlled by neural networks
-    # index matches with the other two
-    birds = []
+    # count this generation's collision checks from zero
+    pipe_class.Pipe.reset_collision_counts()
+    # count this generation's network cache lookups from zero
+    NETWORKS.reset_counts()
+    # everything besides the genome and the course that changes a fitness
+    memo_settings = (DECISION_INTERVAL,)
+    # the genomes that actually play this generation
+    played_genomes = []
+    # only a fixed course gives a genome the same fitness every time, so the
+    # memo is left alone when every generation gets a new one
+    memo = FITNESS_MEMO if COURSE_SEED is not None else None
+    # the birds controlled by neural networks, together with their neural
+    # networks and genomes. dead birds are only marked during a frame and
+    # cleared out once at its end
+    flock = bird_flock_class.BirdFlock()
 
     # NEAT actually gives us a list of genome objects (genomes). NEAT starts 
     # with these genomes which are encodings of potential neural networks (node 
     # genes and connection genes).
     # for each genome given by NEAT
     for genome_id, genome in genomes:
-        # construct the neural network from the genome
-        neural_network = neat.nn.FeedForwardNetwork.create(genome, config)
-        # add it to the list of neural networks
-        neural_networks.append(neural_network)
-        # give it a corresponding Bird to control
-        birds.append(bird_class.Bird(230, 350))
+        # a genome that already flew this course keeps its old fitness
+        if memo is not None:
+            fitness = memo.get(genome, COURSE_SEED, memo_settings)
+            if fitness is not None:
+                genome.fitness = fitness
+                continue
         # set its initial fitness to 0
         genome.fitness = 0
-        # add this genome to the genome list for later usage (keep track of its
-        # fitness and change it as we desire)
-        genome_list.append(genome)
+        # give it a corresponding Bird to control, flown by the genome's row
+        # of the batch network, and keep the genome for later usage (keep
+        # track of its fitness and change it as we desire)
+        flock.add(bird_class.Bird(230, 350), len(played_genomes), genome)
+        played_genomes.append(genome)
+
+    # construct every neural network of the generation at once, so all the
+    # birds can be asked whether to jump in one go
+    batch_network = batch_network_class.BatchNetwork.create(played_genomes, config, NETWORKS.network)
+    # the networks of the birds still alive, in flock order. only rebuilt
+    # when birds die
+    flock_network = batch_network.select(flock.rows)
+    # how well every playing genome is expected to do, by batch network row:
+    # its own fitness last generation, or for a new child its best parent's
+    promise = [LAST_FITNESS.get(genome.key,
+                                max([LAST_FITNESS.get(parent, 0) for parent in ANCESTORS.get(genome.key, ())], default=0))
+               for genome in played_genomes]
 
     # create the floor object
     floor = floor_class.Floor(800)
-    # create the first pipe and put it in the pipes list
-    pipes = [pipe_class.Pipe(700)]
+    # the pipe course for this generation
+    course = course_class.Course(COURSE_SEED)
+    # create the pipe pool and put the first pipe in it
+    pipes = pipe_class.PipePool(course)
+    pipes.add(700)
 
-    # display the game window
-    window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.DOUBLEBUF | pygame.HWSURFACE)
+    # headless training never opens a window or touches the clock
+    if not HEADLESS:
+        # the game window, opened once by run()
+        window = WINDOW
+        renderer = RENDERER
+        # to ensure the game runs at a consistent framerate, set up a clock
+        clock = pygame.time.Clock()
     # initialize the score
     score = 0
-    # to ensure the game runs at a consistent framerate, set up a clock
-    clock = pygame.time.Clock()
+    # the fitness of every bird that is still alive. all birds start
+    # together and get the same rewards while alive, so one running total
+    # covers them all, and a genome's fitness is only written when its bird
+    # dies or the generation ends
+    survivor_fitness = 0
+    # count frames so we know which ones to draw
+    frame = 0
     run = True
     while run:
-        clock.tick(30)
-        # grab external events like keyboard events
-        for event in pygame.event.get():
-            # if the event is a quit keyboard click
-            if event.type == pygame.QUIT:
-                # leave the game loop
-                run = False
-                # quit the game actually
-                pygame.quit()
-                quit()
+        frame += 1
+        # will this frame be shown on screen
+        rendering = not HEADLESS and frame % RENDER_EVERY == 0
+        # only drawn frames are capped at 30 fps and listen for events, the
+        # frames in between run as fast as they can
+        if rendering:
+            clock.tick(30)
+            # grab external events like keyboard events
+            for event in pygame.event.get():
+                # if the event is a quit keyboard click
+                if event.type == pygame.QUIT:
+                    # leave the game loop
+                    run = False
+                    # quit the game actually
+                    pygame.quit()
+                    quit()
         
         pipe_index = 0
         # if there are surviving birds
-        if len(birds) > 0:
+        if len(flock) > 0:
             # if there is more than one pair of pipes and the first pair is
             # behind the birds
-            if len(pipes) > 1 and birds[0].x > pipes[0].x + pipes[0].top_pipe_image.get_width():
+            if len(pipes) > 1 and flock.birds[0].x > pipes[0].x + pipes[0].top_pipe_image.get_width():
                 # the pipe we should be looking at is the second one
                 pipe_index = 1
         # if there are no birds left
@@ -127,48 +237,55 @@ def main(genomes, config):
             # quit this generation
             run = False
             break
+        # if the birds survive a frame from moving, add a little fitness
+        survivor_fitness += 0.1
         # for every bird still playing the game
-        for index_3, bird in enumerate(birds):
-            # move the bird
+        # (every bird in the flock is alive at the start of a frame)
+        # the neural networks only get asked on decision frames
+        deciding = (frame - 1) % DECISION_INTERVAL == 0
+        # move every bird first, a jump never changes where the other birds are
+        for bird in flock.birds:
             bird.move()
-            # if the bird has survived a frame from moving, add a little fitness
-            genome_list[index_3].fitness += 0.1
 
-            # holds the value of the output of the neural network
-            # the arguments are the inputs that we feed the neural networks:
+        if deciding:
+            # the inputs that we feed the neural networks, one row per bird:
             # the bird's y position, the top pipe's vertical distance from
-            # the bird's position, and the bottom pipe's vertical distance from
-            # the bird's position. output is actually a list
-            output = neural_networks[index_3].activate([bird.y, 
-                        abs(bird.y - pipes[pipe_index].top_pipe_end),
-                        abs(bird.y - pipes[pipe_index].bottom_pipe_start)])
-            # if the output reached the jump threshold which is 0.5
-            if output[0] > 0.5:
+            # the bird's position, and the bottom pipe's vertical distance
+            # from the bird's position
+            y = np.array([bird.y for bird in flock.birds])
+            inputs = np.stack([y, np.abs(y - pipes[pipe_index].top_pipe_end),
+                               np.abs(y - pipes[pipe_index].bottom_pipe_start)], axis=1)
+            # a bird jumps if its output reached the jump threshold which is
+            # 0.5, and keeps doing so until the next decision
+            if len(flock_network) != len(flock.rows):
+                flock_network = batch_network.select(flock.rows)
+            flock.actions = list(flock_network.jumps(inputs))
+        for index_3, bird in enumerate(flock.birds):
+            # if the bird's last decision was to jump
+            if flock.actions[index_3]:
                 # make the bird jump
                 bird.jump()
 
+        # check every bird against every pipe at once. all birds fly at the
+        # same x, and every bird in the flock is alive at this point
+        hits = collision.collide_all(pipes, flock.birds[0].x, [bird.y for bird in flock.birds])
+        for index in np.flatnonzero(hits):
+            # we want to discourage the bird from hitting the pipe
+            flock.genomes[index].fitness = survivor_fitness - 1
+            flock.kill(index)
+
         # initialize the conditional for adding pipes
         add_pipe = False
         # intialize the list for pipes to be removed
         remove_pipes = []
         # for every pipe in the game
         for pipe in pipes:
-            # for each bird
-            for index, bird in enumerate(birds):
-                # if the bird collided with the pipe
-                if pipe.collide(bird):
-                    # we want to discourage the bird from hitting the pipe
-                    genome_list[index].fitness -= 1
-                    birds.pop(index)
-                    neural_networks.pop(index)
-                    genome_list.pop(index)
-
-                # if the bird has passed the pipe
-                if not pipe.passed and pipe.x < bird.x:
-                    # make the pipe into a passed one
-                    pipe.passed = True
-                    # we are ready to add a new pipe
-                    add_pipe = True
+            # if the birds have passed the pipe
+            if not pipe.passed and pipe.x < flock.birds[0].x:
+                # make the pipe into a passed one
+                pipe.passed = True
+                # we are ready to add a new pipe
+                add_pipe = True
             
             # if the pipe is completely off the screen
             if pipe.x + pipe.top_pipe_image.get_width() < 0:
@@ -182,15 +299,21 @@ def main(genomes, config):
         if add_pipe:
             # add 1 point to game score
             score += 1
-            # for each genome still in the game
-            for surviving_genome in genome_list:
-                # give them 5 points for getting through said pipe
-                surviving_genome.fitness += 5
-            pipes.append(pipe_class.Pipe(600))
+            # give every bird still in the game 5 points for getting
+            # through said pipe
+            survivor_fitness += 5
+            pipes.add(600)
         
         # save the best bird if score hits 50
         if score >= 35:
-            save_best_bird(genome_list[0], neural_networks[0])
+            # the generation ends, so the survivors get their fitness now
+            survivors = [index for index, bird in flock.living()]
+            for index in survivors:
+                flock.genomes[index].fitness = survivor_fitness
+            # save the first survivor
+            if survivors:
+                best_genome = flock.genomes[survivors[0]]
+                save_best_bird(best_genome, neat.nn.FeedForwardNetwork.create(best_genome, config))
             run = False
             break
 
@@ -199,29 +322,124 @@ def main(genomes, config):
             # remove the pipe
             pipes.remove(removing_pipe)
 
-        for index_2, bird in enumerate(birds):
+        for index_2, bird in flock.living():
             # if the bird has hit the ground or flew to the sky
             if bird.y + bird.image.get_height() > 800 or bird.y < 0:
-                birds.pop(index_2)
-                neural_networks.pop(index_2)
-                genome_list.pop(index_2)
+                flock.genomes[index_2].fitness = survivor_fitness
+                flock.kill(index_2)
+
+        # clear this frame's dead birds out of the flock in one go
+        flock.compact()
 
         floor.move()
-        draw_game(window, birds, pipes, floor, score, GENERATION, len(birds))
+        # the simulation above is identical in both modes, we just skip drawing
+        if rendering:
+            # pick which birds to show, the HUD still counts every bird
+            shown_birds = flock.birds
+            if SPECTATE_TOP is not None:
+                fittest = heapq.nlargest(SPECTATE_TOP, range(len(flock.birds)),
+                                         key=lambda index: promise[flock.rows[index]])
+                shown_birds = [flock.birds[index] for index in fittest]
+            draw_game(window, shown_birds, pipes, floor, score, GENERATION, len(flock), renderer)
+
+        # report how long it took to get the very first frame done
+        if TIMING and FIRST_FRAME_TIME is None:
+            FIRST_FRAME_TIME = time.perf_counter() - START_TIME
+            print("Time to first frame: {0:.3f} sec".format(FIRST_FRAME_TIME))
 
-def run(configuration_file_path):
+    # show how many collision checks the cheap tests saved us
+    if COLLISION_STATS:
+        print("Collision checks:", pipe_class.Pipe.collision_counts())
+    # remember this generation's fitnesses to pick who to spectate next time
+    LAST_FITNESS = {genome.key: genome.fitness for genome_id, genome in genomes}
+    # remember the new fitnesses for the next generations (and runs)
+    if memo is not None:
+        for genome in played_genomes:
+            memo.put(genome, COURSE_SEED, memo_settings, genome.fitness)
+        memo.save()
+        print("Fitness memo: {hits} known, {misses} played".format(**memo.counts()))
+        memo.reset_counts()
+    # show how many neural networks we didn't have to build
+    if TIMING:
+        print("Network cache: {hits} hits, {misses} misses".format(**NETWORKS.counts()))
+
+def open_window():
+    # display the game window, once for the whole run
+    global WINDOW, RENDERER
+    WINDOW = pygame.display.set_mode(assets.image(BACKGROUND_IMAGE).get_size(), pygame.DOUBLEBUF | pygame.HWSURFACE)
+    # blitting is much faster in the display's own pixel format, whether
+    # we redraw everything or only what changed
+    assets.convert()
+    if DIRTY_RECTANGLES:
+        RENDERER = renderer_class.DirtyRenderer(WINDOW, assets.image(BACKGROUND_IMAGE))
+
+def run(configuration_file_path, headless=False, workers=0, seed=None,
+        collision_stats=False, dirty_rectangles=False, render_every=1,
+        spectate_top=None, timing=False, decision_interval=1, memo=False,
+        memo_file=None, serve_port=None, serve_host="127.0.0.1", islands=0,
+        migrate_every=5, migrants=2, topology="ring", steady_state=False,
+        checkpoint_every=0, resume=None):
+    # choose between watching the birds (windowed) or training at full speed
+    global HEADLESS, COURSE_SEED, COLLISION_STATS, DIRTY_RECTANGLES
+    global RENDER_EVERY, SPECTATE_TOP, TIMING, DECISION_INTERVAL
+    global FITNESS_MEMO, GENERATION, ANCESTORS
+    # the networks have to decide at least once, on the very first frame
+    if decision_interval < 1:
+        raise ValueError("decision_interval must be at least 1, got {0}".format(decision_interval))
+    HEADLESS = headless
+    # only start the pygame parts we need, headless training needs none
+    display = (not headless and not workers and not serve_port
+               and not islands and not steady_state)
+    assets.start(display=display)
+    # fly every generation through the same course if given a seed
+    COURSE_SEED = seed
+    # report collision check counts after every generation
+    COLLISION_STATS = collision_stats
+    # draw only the changed parts of the window
+    DIRTY_RECTANGLES = dirty_rectangles
+    # how often, and how many birds, to draw while watching
+    RENDER_EVERY = render_every
+    SPECTATE_TOP = spectate_top
+    # how many frames every jump decision lasts
+    DECISION_INTERVAL = decision_interval
+    # watched runs draw every generation in the same window
+    if display:
+        open_window()
+    # skip genomes whose fitness on the seeded course is already known,
+    # optionally keeping what we learn in a file between runs
+    if memo or memo_file:
+        FITNESS_MEMO = fitness_memo_class.FitnessMemo(memo_file)
+    # report startup times
+    TIMING = timing
+    if TIMING:
+        print("Import time: {0:.3f} sec".format(IMPORT_TIME))
     # connects the config file to our code, by connecting all of our subheadings
     # in our text file, we're telling neat all the properties that we're setting
     config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction, 
                     neat.DefaultSpeciesSet, neat.DefaultStagnation, 
                     configuration_file_path)
-    # generate the genome population
-    population = neat.Population(config)
+    if resume:
+        # carry on with the population, species, random numbers and
+        # statistics of a checkpoint
+        population, stats = checkpoint_class.restore(resume, config)
+        GENERATION = population.generation
+    else:
+        # generate the genome population
+        population = neat.Population(config)
+        stats = neat.StatisticsReporter()
     # stats reporters, gives us the terminal output that details the NEAT run
     # with information such as generation statistics
     population.add_reporter(neat.StdOutReporter(True))
-    stats = neat.StatisticsReporter()
+    # the parents of every genome bred from here on
+    ANCESTORS = population.reproduction.ancestors
     population.add_reporter(stats)
+    # save the run every few generations, from a background thread
+    checkpointer = None
+    if checkpoint_every:
+        checkpointer = checkpoint_class.AsyncCheckpointer(population, stats, checkpoint_every)
+        population.add_reporter(checkpointer)
+    # a resumed run only plays the generations it has left
+    generations = 50 - population.generation
 
     # 50 means how many generations we are gonna run.
     # it also calls the main function 50 times and pass it all of the genomes
@@ -229,11 +447,120 @@ def run(configuration_file_path):
     # (in reality, genomes) that were given.
     # put the population through my main game loop and if we get a winner,
     # return him
-    winner = population.run(main, 50)
+    try:
+        if steady_state:
+            # no generations: every dead bird is replaced by a new child at once,
+            # for as many evaluations as 50 generations would take
+            winner = steady_state_game.run_steady_state(config, 50 * config.pop_size,
+                            workers or None, seed=seed, decision_interval=decision_interval)
+            save_best_bird(winner, neat.nn.FeedForwardNetwork.create(winner, config))
+        elif workers:
+            # every genome plays its own headless game in a pool of processes
+            evaluator = parallel_game.ParallelEvaluator(workers, seed=seed,
+                            decision_interval=decision_interval, memo=FITNESS_MEMO)
+            if TIMING:
+                print("Worker startup time: {0:.3f} sec".format(evaluator.startup_time))
+            try:
+                winner = population.run(evaluator.evaluate, generations)
+            finally:
+                evaluator.close()
+            save_best_bird(winner, neat.nn.FeedForwardNetwork.create(winner, config))
+        elif islands:
+            # several populations evolve side by side, one per process, and
+            # trade their best genomes every few generations
+            hall_of_fame = island_game.run_islands(configuration_file_path, islands, 50,
+                            migrate_every, migrants, topology, seed, decision_interval)
+            print("Hall of fame:")
+            for genome in hall_of_fame:
+                print("  genome {0}: fitness {1:.1f}".format(genome.key, genome.fitness))
+            # the champion of every island becomes the best bird
+            winner = hall_of_fame[0]
+            save_best_bird(winner, neat.nn.FeedForwardNetwork.create(winner, config))
+        elif serve_port:
+            # every genome is played by workers (distributed_game.py) that
+            # connect over the network
+            evaluator = distributed_game.Coordinator(serve_host, serve_port, seed=seed,
+                            decision_interval=decision_interval)
+            try:
+                winner = population.run(evaluator.evaluate, generations)
+            finally:
+                evaluator.close()
+            save_best_bird(winner, neat.nn.FeedForwardNetwork.create(winner, config))
+        else:
+            winner = population.run(main, generations)
+    finally:
+        # let the last checkpoints finish writing, even if the run failed
+        if checkpointer is not None:
+            checkpointer.close()
+
+def positive_int(text):
+    # argparse type for options that must be at least 1
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError("must be at least 1, got {0}".format(value))
+    return value
 
 if __name__ == "__main__":
+    # command line options for the training run
+    parser = argparse.ArgumentParser(description="Train flappy birds with NEAT")
+    parser.add_argument("--headless", action="store_true",
+                        help="train without a window, as fast as possible")
+    parser.add_argument("--workers", type=positive_int, default=0,
+                        help="evaluate genomes in this many worker processes")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="fly every generation through this pipe course")
+    parser.add_argument("--collision-stats", action="store_true",
+                        help="print collision check counts every generation")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="redraw only the parts of the window that changed")
+    parser.add_argument("--render-every", type=positive_int, default=1,
+                        help="only draw every Nth frame while watching")
+    parser.add_argument("--spectate", type=int, default=None,
+                        help="only draw this many of the most promising birds")
+    parser.add_argument("--timing", action="store_true",
+                        help="print import, worker startup and first frame times")
+    parser.add_argument("--decision-interval", type=positive_int, default=1,
+                        help="only ask the neural networks every this many frames")
+    parser.add_argument("--memo", action="store_true",
+                        help="don't replay genomes already played on the --seed course")
+    parser.add_argument("--memo-file", default=None,
+                        help="like --memo, and keep the known fitnesses in this file")
+    parser.add_argument("--serve", type=int, default=None, metavar="PORT",
+                        help="hand genomes to distributed_game.py workers on this port")
+    parser.add_argument("--serve-host", default="127.0.0.1",
+                        help="address to listen on for workers with --serve")
+    parser.add_argument("--islands", type=positive_int, default=0,
+                        help="evolve this many populations side by side, one per process")
+    parser.add_argument("--migrate-every", type=positive_int, default=5,
+                        help="generations between migrations with --islands")
+    parser.add_argument("--migrants", type=int, default=2,
+                        help="best genomes each island sends away when migrating")
+    parser.add_argument("--topology", choices=island_game.TOPOLOGIES, default="ring",
+                        help="ring sends migrants to the next island, all to every island")
+    parser.add_argument("--steady-state", action="store_true",
+                        help="replace every dead bird with a new child right away (rtNEAT)")
+    parser.add_argument("--checkpoint-every", type=int, default=0,
+                        help="save a checkpoint to checkpoints/ every this many generations")
+    parser.add_argument("--resume", default=None, metavar="CHECKPOINT",
+                        help="carry on a run from a checkpoint file")
+    arguments = parser.parse_args()
+    # islands and steady state runs don't go through population.run, which
+    # is what checkpoints save and resume
+    if (arguments.checkpoint_every or arguments.resume) and (arguments.islands or arguments.steady_state):
+        parser.error("--checkpoint-every and --resume can't be used with --islands or --steady-state")
     # this gives us the path of the directory that we're currently in
     local_directory = os.path.dirname(__file__)
     # now, we can grab the configuration file using the local directory
     configuration_file_path = os.path.join(local_directory, "config-feedforward.txt")
-    run(configuration_file_path)
\ No newline at end of file
+    run(configuration_file_path, headless=arguments.headless,
+        workers=arguments.workers, seed=arguments.seed,
+        collision_stats=arguments.collision_stats,
+        dirty_rectangles=arguments.dirty_rects,
+        render_every=arguments.render_every, spectate_top=arguments.spectate,
+        timing=arguments.timing, decision_interval=arguments.decision_interval,
+        memo=arguments.memo, memo_file=arguments.memo_file,
+        serve_port=arguments.serve, serve_host=arguments.serve_host,
+        islands=arguments.islands, migrate_every=arguments.migrate_every,
+        migrants=arguments.migrants, topology=arguments.topology,
+        steady_state=arguments.steady_state,
+        checkpoint_every=arguments.checkpoint_every, resume=arguments.resume)
@@ -0,0 +1,63 @@
+import hashlib
+import neat
+from collections import OrderedDict
+
+def genome_hash(genome):
+    # fingerprint of everything that shapes the genome's neural network:
+    # every node with its settings and every enabled connection with its
+    # weight. two genomes with the same hash build the same network, and
+    # the hash is the same in every process and every run
+    nodes = sorted((key, node.bias, node.response, node.activation, node.aggregation)
+                   for key, node in genome.nodes.items())
+    connections = sorted((key, connection.weight)
+                         for key, connection in genome.connections.items()
+                         if connection.enabled)
+    return hashlib.sha1(repr((nodes, connections)).encode()).hexdigest()
+
+class NetworkCache:
+    # how many compiled neural networks we keep around
+    SIZE = 256
+
+    def __init__(self, build=neat.nn.FeedForwardNetwork.create, size=SIZE):
+        # how a genome is turned into its network, build(genome, config)
+        self.build = build
+        # maximum number of neural networks kept
+        self.size = size
+        # (genome, compiled neural network) by genome key, least recently
+        # used first. neat never changes a genome once it's made, so only
+        # genomes carried over unchanged into the next generation (the
+        # elites) are ever found here. keys start over in every population,
+        # so a hit also has to be the very same genome object
+        self.networks = OrderedDict()
+        # lookups answered from the cache and lookups that had to build
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.networks)
+
+    def reset_counts(self):
+        # start counting hits and misses from zero (every generation)
+        self.hits = 0
+        self.misses = 0
+
+    def counts(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def network(self, genome, config):
+        # hand back the genome's network, only building it the first time
+        # the genome is seen
+        cached = self.networks.get(genome.key)
+        if cached is None or cached[0] is not genome:
+            self.misses += 1
+            neural_network = self.build(genome, config)
+            self.networks[genome.key] = (genome, neural_network)
+            self.networks.move_to_end(genome.key)
+            # forget the least recently used network if we have too many
+            if len(self.networks) > self.size:
+                self.networks.popitem(last=False)
+        else:
+            self.hits += 1
+            self.networks.move_to_end(genome.key)
+            neural_network = cached[1]
+        return neural_network
@@ -0,0 +1,149 @@
+import bird_class
+import pipe_class
+import course_class
+import random
+import time
+import neat
+from multiprocessing import Pool
+
+# the game stops once a bird reaches this score, same as neat_game.main
+MAX_SCORE = 35
+# birds die if they go below the floor
+FLOOR_Y = 800
+
+def play_genome(genome, config, seed, decision_interval=1):
+    # play one headless game with a single bird and return its fitness
+    neural_network = neat.nn.FeedForwardNetwork.create(genome, config)
+    return play_network(neural_network, seed, decision_interval)
+
+def play_network(neural_network, seed, decision_interval=1):
+    # play one headless game with a bird flown by an already built neural
+    # network and return its fitness. the rules and the order they are
+    # applied in mirror neat_game.main, so the bird scores exactly what it
+    # would in the shared game loop
+    # every genome given the same seed flies through the same pipes
+    course = course_class.Course(seed)
+
+    bird = bird_class.Bird(230, 350)
+    pipes = pipe_class.PipePool(course)
+    pipes.add(700)
+    fitness = 0
+    score = 0
+    frame = 0
+    # the last jump decision, repeated until the next one
+    jumping = False
+    while True:
+        frame += 1
+        pipe_index = 0
+        # if the first pair of pipes is behind the bird, look at the second
+        if len(pipes) > 1 and bird.x > pipes[0].x + pipes[0].top_pipe_image.get_width():
+            pipe_index = 1
+
+        bird.move()
+        # a little fitness for surviving a frame
+        fitness += 0.1
+        # the neural network only decides every decision_interval frames
+        if (frame - 1) % decision_interval == 0:
+            output = neural_network.activate([bird.y,
+                        abs(bird.y - pipes[pipe_index].top_pipe_end),
+                        abs(bird.y - pipes[pipe_index].bottom_pipe_start)])
+            jumping = output[0] > 0.5
+        if jumping:
+            bird.jump()
+
+        add_pipe = False
+        remove_pipes = []
+        for pipe in pipes:
+            # hitting a pipe costs a point and ends the game
+            if pipe.collide(bird):
+                return fitness - 1
+
+            if not pipe.passed and pipe.x < bird.x:
+                pipe.passed = True
+                add_pipe = True
+
+            if pipe.x + pipe.top_pipe_image.get_width() < 0:
+                remove_pipes.append(pipe)
+
+            pipe.move()
+
+        if add_pipe:
+            score += 1
+            # 5 points for getting through a pipe
+            fitness += 5
+            pipes.add(600)
+
+        # a perfect bird ends the game, just like in the shared loop
+        if score >= MAX_SCORE:
+            return fitness
+
+        for removing_pipe in remove_pipes:
+            pipes.remove(removing_pipe)
+
+        # hitting the ground or flying into the sky ends the game
+        if bird.y + bird.image.get_height() > FLOOR_Y or bird.y < 0:
+            return fitness
+
+def play_genomes(genomes, config, seed, decision_interval=1):
+    # worker entry point: play a chunk of genomes one after another
+    return [play_genome(genome, config, seed, decision_interval) for genome in genomes]
+
+class ParallelEvaluator:
+    def __init__(self, workers=None, chunk_size=1, seed=None, decision_interval=1,
+                 memo=None):
+        # number of worker processes (None uses every core)
+        self.workers = workers
+        # how many genomes are sent to a worker at a time
+        self.chunk_size = chunk_size
+        # course seed shared by every genome. if None, each generation gets a
+        # fresh random course, like the shared game loop does
+        self.seed = seed
+        # frames between the neural network's jump decisions
+        if decision_interval < 1:
+            raise ValueError("decision_interval must be at least 1, got {0}".format(decision_interval))
+        self.decision_interval = decision_interval
+        # optional FitnessMemo, genomes it already knows aren't sent to a worker
+        self.memo = memo
+        # start the workers, timing how long that takes
+        start_time = time.perf_counter()
+        self.pool = Pool(workers)
+        self.startup_time = time.perf_counter() - start_time
+
+    def close(self):
+        # shut the worker processes down
+        self.pool.close()
+        self.pool.join()
+
+    def evaluate(self, genomes, config):
+        # pass this to population.run in place of neat_game.main
+        seed = self.seed if self.seed is not None else random.randrange(2**32)
+        # only a fixed course gives a genome the same fitness every time, so
+        # the memo is left alone when every generation gets a new one
+        memo = self.memo if self.seed is not None else None
+        # everything besides the genome and the course that changes a fitness
+        memo_settings = (self.decision_interval,)
+        genome_objects = []
+        for genome_id, genome in genomes:
+            fitness = None
+            if memo is not None:
+                fitness = memo.get(genome, self.seed, memo_settings)
+            # only genomes with an unknown fitness have to play
+            if fitness is None:
+                genome_objects.append(genome)
+            else:
+                genome.fitness = fitness
+        chunks = [genome_objects[i:i + self.chunk_size]
+                  for i in range(0, len(genome_objects), self.chunk_size)]
+        jobs = [self.pool.apply_async(play_genomes, (chunk, config, seed, self.decision_interval)) for chunk in chunks]
+
+        # put the fitness values back into the genomes, in order
+        for chunk, job in zip(chunks, jobs):
+            for genome, fitness in zip(chunk, job.get()):
+                genome.fitness = fitness
+                if memo is not None:
+                    memo.put(genome, self.seed, memo_settings, fitness)
+        # keep the new fitnesses for the next generations (and runs)
+        if memo is not None:
+            memo.save()
+            print("Fitness memo: {hits} known, {misses} played".format(**memo.counts()))
+            memo.reset_counts()
@@ -1,9 +1,9 @@
-import pygame
-import os
 import random
+import assets
 
-# load the pipe image from files
-PIPE_IMAGE = pygame.transform.scale2x(pygame.image.load(os.path.join("images", "pipe.png")))
+# name of the pipe image, loaded by the asset registry when first needed.
+# the top pipe is the same image upside down, flipped once for every pipe
+PIPE_IMAGE = "pipe"
 
 class Pipe:
     # the gap between the two pipes
@@ -14,10 +14,23 @@ class Pipe:
     MIN_PIPE_HEIGHT = 50
     # the lowest the pipes can be
     MAX_PIPE_HEIGHT = 500
+    # how many collide calls each phase settled, for all pipes together:
+    # bird not in the pipe's column, bird inside the gap, pixel masks needed
+    x_rejects = 0
+    gap_rejects = 0
+    mask_checks = 0
+    # sprites and masks shared by every pipe, looked up once when the first
+    # pipe is made
+    top_pipe_image = None
+    bottom_pipe_image = None
+    top_pipe_mask = None
+    bottom_pipe_mask = None
 
-    def __init__(self, x):
+    def __init__(self, x, course=None):
         # horizontal position
         self.x = x
+        # the course the pipe heights come from (None means global random)
+        self.course = course
         # store the bottom end of the top pipe
         self.top_pipe_end = 0
         # store the top end of the top pipe (where we draw the pipe from)
@@ -25,25 +38,45 @@ class Pipe:
         # bottom pipe draw location (top end of bottom pipe)
         self.bottom_pipe_start = 0
 
-        # the top pipe image
-        self.top_pipe_image = pygame.transform.flip(PIPE_IMAGE, False, True)
-        # bottom pipe image
-        self.bottom_pipe_image = PIPE_IMAGE
-
         # a conditional to determine if the bird pipe passed the pipes
         self.passed = False
 
+        # the first pipe loads the sprites every pipe uses
+        if Pipe.top_pipe_image is None:
+            Pipe.load_images()
+
         # let's initialize the locations of the pipe pair
         self.set_height()
 
-        # compute the mask of the top pipe
-        self.top_pipe_mask = pygame.mask.from_surface(self.top_pipe_image)
-        # the mask of the bottom pipe
-        self.bottom_pipe_mask = pygame.mask.from_surface(self.bottom_pipe_image)
+    @classmethod
+    def load_images(cls):
+        # the top pipe image, which is the bottom one upside down
+        cls.top_pipe_image = assets.image(PIPE_IMAGE, flipped=True)
+        # bottom pipe image
+        cls.bottom_pipe_image = assets.image(PIPE_IMAGE)
+        # the masks of the top and bottom pipe
+        cls.top_pipe_mask = assets.mask(PIPE_IMAGE, flipped=True)
+        cls.bottom_pipe_mask = assets.mask(PIPE_IMAGE)
+
+    @classmethod
+    def reload_images(cls):
+        # pick up the converted sprites, if the pipes had loaded any
+        if cls.top_pipe_image is not None:
+            cls.load_images()
+
+    def reset(self, x):
+        # reuse this pipe as a brand new one at the given position
+        self.x = x
+        self.passed = False
+        self.set_height()
 
     def set_height(self):
-        # pick a random location for the top pipe
-        self.top_pipe_end = random.randrange(self.MIN_PIPE_HEIGHT, self.MAX_PIPE_HEIGHT)
+        # take the next location from the course if we're following one
+        if self.course is not None:
+            self.top_pipe_end = self.course.next_height()
+        # otherwise pick a random location for the top pipe
+        else:
+            self.top_pipe_end = random.randrange(self.MIN_PIPE_HEIGHT, self.MAX_PIPE_HEIGHT)
         # calculate where we should draw the top pipe using the pipe's height
         # and its randomized bottom end location
         self.top_pipe_start = self.top_pipe_end - self.top_pipe_image.get_height()
@@ -56,27 +89,111 @@ class Pipe:
 
     def draw(self, window):
         # draw the top pipe at its proper location
-        window.blit(self.top_pipe_image, (self.x, self.top_pipe_start))
+        top_pipe_rectangle = window.blit(self.top_pipe_image, (self.x, self.top_pipe_start))
         # draw the bottom pipe at its proper location
-        window.blit(self.bottom_pipe_image, (self.x, self.bottom_pipe_start))
+        bottom_pipe_rectangle = window.blit(self.bottom_pipe_image, (self.x, self.bottom_pipe_start))
+        # the areas of the window we drew over
+        return [top_pipe_rectangle, bottom_pipe_rectangle]
+
+    @classmethod
+    def reset_collision_counts(cls):
+        # start counting collide calls from zero again
+        cls.x_rejects = 0
+        cls.gap_rejects = 0
+        cls.mask_checks = 0
+
+    @classmethod
+    def collision_counts(cls):
+        # how many collide calls each phase settled since the last reset
+        return {"x_rejects": cls.x_rejects, "gap_rejects": cls.gap_rejects,
+                "mask_checks": cls.mask_checks}
 
     def collide(self, bird):
+        # grab the bird's mask
+        bird_mask = bird.get_mask()
+        bird_width, bird_height = bird_mask.get_size()
+        bird_y = round(bird.y)
+
+        # broad phase: a bird outside the pipe's column can't hit it
+        if bird.x + bird_width <= self.x or self.x + self.top_pipe_image.get_width() <= bird.x:
+            Pipe.x_rejects += 1
+            return False
+        # a bird completely inside the gap can't hit either pipe
+        if bird_y >= self.top_pipe_end and bird_y + bird_height <= self.bottom_pipe_start:
+            Pipe.gap_rejects += 1
+            return False
+        Pipe.mask_checks += 1
+
         # grab the manhattan distance between bird and top pipe
-        top_pipe_offset = (self.x - bird.x, self.top_pipe_start - round(bird.y))
+        top_pipe_offset = (self.x - bird.x, self.top_pipe_start - bird_y)
         # the manhattan distance between bird and bottom pipe
-        bottom_pipe_offset = (self.x - bird.x, self.bottom_pipe_start - round(bird.y))
+        bottom_pipe_offset = (self.x - bird.x, self.bottom_pipe_start - bird_y)
 
-        # grab the bird's mask
-        bird_mask = bird.get_mask()
         # collision points between visible pixels of bird and top pipe
-        # calculated using mask overlap
-        top_pipe_points = bird_mask.overlap(self.top_pipe_mask, top_pipe_offset)
-        # collision points between bird and bottom pipe
-        bottom_pipe_points = bird_mask.overlap(self.bottom_pipe_mask, bottom_pipe_offset)
+        # calculated using mask overlap, only if the bird reaches above the gap
+        top_pipe_points = None
+        if bird_y < self.top_pipe_end:
+            top_pipe_points = bird_mask.overlap(self.top_pipe_mask, top_pipe_offset)
+        # collision points between bird and bottom pipe, only if the bird
+        # reaches below the gap
+        bottom_pipe_points = None
+        if bird_y + bird_height > self.bottom_pipe_start:
+            bottom_pipe_points = bird_mask.overlap(self.bottom_pipe_mask, bottom_pipe_offset)
 
         # if collision points exist for either pipe
         if bottom_pipe_points or top_pipe_points:
             # notify the collision occurred
             return True
         # no collision has occurred
-        return False
\ No newline at end of file
+        return False
+
+# blit the converted sprites once the display has them
+assets.on_convert(Pipe.reload_images)
+
+class PipePool:
+    # at most 3 pipes are ever on screen, so 4 slots leave room to spare
+    SIZE = 4
+
+    def __init__(self, course=None, size=SIZE):
+        # the course every pipe of the pool takes its heights from
+        self.course = course
+        # ring buffer of pipes, created the first time each slot is used
+        self.slots = [None] * size
+        # slot of the oldest active pipe
+        self.first = 0
+        # number of active pipes
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        # the index-th active pipe, oldest first
+        if not 0 <= index < self.count:
+            raise IndexError("pipe index out of range")
+        return self.slots[(self.first + index) % len(self.slots)]
+
+    def __iter__(self):
+        # active pipes from oldest to newest
+        for index in range(self.count):
+            yield self.slots[(self.first + index) % len(self.slots)]
+
+    def add(self, x):
+        # recycle the next free slot as a new pipe at the given position
+        if self.count == len(self.slots):
+            raise IndexError("pipe pool is full")
+        slot = (self.first + self.count) % len(self.slots)
+        if self.slots[slot] is None:
+            self.slots[slot] = Pipe(x, self.course)
+        else:
+            self.slots[slot].reset(x)
+        self.count += 1
+        return self.slots[slot]
+
+    def remove(self, pipe):
+        # pipes leave the screen in the order they came in, so only the
+        # oldest pipe can be removed
+        if self.count == 0 or self.slots[self.first] is not pipe:
+            raise ValueError("only the oldest pipe can be removed")
+        self.first = (self.first + 1) % len(self.slots)
+        self.count -= 1
@@ -0,0 +1,32 @@
+import pygame
+
+class DirtyRenderer:
+    def __init__(self, window, background):
+        # the display surface we draw on
+        self.window = window
+        # the background never has transparent pixels, so plain convert
+        self.background = background.convert()
+        # areas drawn over last frame, they need the background back
+        self.previous_rectangles = []
+        # areas drawn over this frame
+        self.rectangles = []
+
+        # the first frame shows the whole background once
+        self.window.blit(self.background, (0, 0))
+        pygame.display.update()
+
+    def clear(self):
+        # paint the background back over only what was drawn last frame
+        for rectangle in self.previous_rectangles:
+            self.window.blit(self.background, rectangle, rectangle)
+
+    def add(self, rectangles):
+        # remember the areas the sprites of this frame drew over
+        self.rectangles.extend(rectangles)
+
+    def update(self):
+        # push only the areas that changed: where things were last frame
+        # (now background again) and where they are now
+        pygame.display.update(self.previous_rectangles + self.rectangles)
+        self.previous_rectangles = self.rectangles
+        self.rectangles = []
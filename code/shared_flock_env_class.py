@@ -0,0 +1,178 @@
+import random
+import time
+import numpy as np
+from multiprocessing import Process, Semaphore
+from multiprocessing import shared_memory
+import flock_env_class
+
+# what the workers are told to do next
+STEP = 0
+RESET = 1
+CLOSE = 2
+
+def shared_array(shape, dtype, name=None):
+    # a numpy array living in shared memory. without a name a new block is
+    # made, with a name we attach to the block another process made
+    dtype = np.dtype(dtype)
+    if name is None:
+        size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        block = shared_memory.SharedMemory(create=True, size=size)
+    else:
+        block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+def run_worker(worker, start, stop, names, commanded, finished):
+    # worker process entry point: play games start to stop of the whole
+    # batch, reading actions from and writing results into shared memory
+    blocks = []
+    arrays = {}
+    for key, (shape, dtype, name) in names.items():
+        block, array = shared_array(shape, dtype, name)
+        blocks.append(block)
+        arrays[key] = array
+    env = flock_env_class.FlockEnv(stop - start)
+    try:
+        while True:
+            # wait for the main process to hand out a command
+            commanded.acquire()
+            command = arrays["control"][0]
+            if command == CLOSE:
+                break
+            if command == RESET:
+                arrays["observations"][start:stop] = env.reset(int(arrays["control"][1]))
+                arrays["rewards"][start:stop] = 0
+                arrays["dones"][start:stop] = False
+            else:
+                observations, rewards, dones, info = env.step(arrays["actions"][start:stop])
+                arrays["observations"][start:stop] = observations
+                arrays["rewards"][start:stop] = rewards
+                arrays["dones"][start:stop] = dones
+            arrays["scores"][worker] = env.score
+            # tell the main process this worker's games are done
+            finished.release()
+    finally:
+        # drop our views before letting go of the shared memory. a worker
+        # that raised just exits, and the main process notices it's gone
+        arrays.clear()
+        for block in blocks:
+            block.close()
+
+class SharedFlockEnv:
+    # a FlockEnv split over worker processes, which exchange everything with
+    # us through shared memory. same lockstep rules: every worker's games
+    # fly the one course, and finished games wait for the next reset
+    # seconds the workers get to finish a command before we give up on them
+    TIMEOUT = 60.0
+    # seconds between checks that every worker is still alive while waiting
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, num_games, workers, timeout=TIMEOUT):
+        # number of games played side by side, split over the workers
+        self.num_games = num_games
+        self.workers = workers
+        self.timeout = timeout
+        # every buffer the main process and the workers exchange, allocated
+        # once up front so nothing gets pickled while playing
+        shapes = {
+            "observations": ((num_games, 3), np.float64),
+            "actions": ((num_games,), np.bool_),
+            "rewards": ((num_games,), np.float64),
+            "dones": ((num_games,), np.bool_),
+            "scores": ((workers,), np.int64),
+            # the command for the workers, and the course seed for a reset
+            "control": ((2,), np.int64),
+        }
+        self.blocks = []
+        self.arrays = {}
+        names = {}
+        for key, (shape, dtype) in shapes.items():
+            block, array = shared_array(shape, dtype)
+            array[...] = 0
+            self.blocks.append(block)
+            self.arrays[key] = array
+            names[key] = (shape, dtype, block.name)
+
+        # every worker gets a semaphore telling it a command is ready and one
+        # telling us its results are written. unlike a barrier, waiting on
+        # them can time out and never hangs on a worker that died while
+        # waiting itself
+        self.commanded = [Semaphore(0) for worker in range(workers)]
+        self.finished = [Semaphore(0) for worker in range(workers)]
+        # set once a worker died or hung, the games can't go on after that
+        self.broken = False
+        # split the games as evenly as possible
+        bounds = np.linspace(0, num_games, workers + 1).astype(int)
+        self.processes = []
+        for worker in range(workers):
+            process = Process(target=run_worker,
+                              args=(worker, bounds[worker], bounds[worker + 1], names,
+                                    self.commanded[worker], self.finished[worker]),
+                              daemon=True)
+            process.start()
+            self.processes.append(process)
+
+    def __len__(self):
+        return self.num_games
+
+    def check_worker(self, worker):
+        # raise if a worker process is gone, its games will never finish
+        process = self.processes[worker]
+        if not process.is_alive():
+            self.broken = True
+            raise RuntimeError("shared flock env worker {0} died (exit code {1})".format(
+                worker, process.exitcode))
+
+    def command(self, command, argument=0):
+        # hand every worker a command and wait until all of them finished it
+        if self.broken:
+            raise RuntimeError("shared flock env is broken, a worker died or hung earlier")
+        for worker in range(self.workers):
+            self.check_worker(worker)
+        self.arrays["control"][0] = command
+        self.arrays["control"][1] = argument
+        for commanded in self.commanded:
+            commanded.release()
+        deadline = time.monotonic() + self.timeout
+        for worker, finished in enumerate(self.finished):
+            while not finished.acquire(timeout=self.POLL_INTERVAL):
+                self.check_worker(worker)
+                if time.monotonic() > deadline:
+                    self.broken = True
+                    raise RuntimeError("shared flock env worker {0} didn't answer within {1} sec".format(
+                        worker, self.timeout))
+
+    def reset(self, seed=None):
+        # start every game over on the same course. without a seed we pick
+        # one here, so all the workers still fly through the same pipes
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.command(RESET, seed)
+        return self.arrays["observations"].copy()
+
+    def step(self, actions):
+        # play one frame of every game, same results as FlockEnv.step
+        self.arrays["actions"][:] = actions
+        self.command(STEP)
+        return (self.arrays["observations"].copy(), self.arrays["rewards"].copy(),
+                self.arrays["dones"].copy(), {"score": int(self.arrays["scores"].max())})
+
+    def close(self):
+        # shut the workers down and free the shared memory, even after a
+        # worker died or hung
+        try:
+            # tell every worker still listening to stop, without waiting on
+            # the ones that can't answer
+            self.arrays["control"][0] = CLOSE
+            for commanded in self.commanded:
+                commanded.release()
+        finally:
+            for process in self.processes:
+                process.join(timeout=5)
+                # a worker that's still around is hung, don't ask it nicely
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+            self.arrays.clear()
+            for block in self.blocks:
+                block.close()
+                block.unlink()
@@ -0,0 +1,149 @@
+import math
+import os
+import queue
+import random
+import time
+import neat
+import parallel_game
+from multiprocessing import Pool
+
+def parents(species, survival_threshold):
+    # the members of a species allowed to breed: the fittest fraction, and
+    # at least two, same as DefaultReproduction
+    members = sorted(species.members.values(), key=lambda genome: genome.fitness, reverse=True)
+    cutoff = max(int(math.ceil(survival_threshold * len(members))), 2)
+    return members[:cutoff]
+
+def breed(population):
+    # one child from a species picked in proportion to its average fitness
+    config = population.config
+    species = list(population.species.species.values())
+    averages = [sum(genome.fitness for genome in s.members.values()) / len(s.members) for s in species]
+    # shift the averages so even the worst species gets a small chance
+    lowest = min(averages)
+    weights = [average - lowest + 1.0 for average in averages]
+    chosen = random.choices(species, weights)[0]
+
+    breeders = parents(chosen, config.reproduction_config.survival_threshold)
+    parent1 = random.choice(breeders)
+    parent2 = random.choice(breeders)
+    key = next(population.reproduction.genome_indexer)
+    child = config.genome_type(key)
+    child.configure_crossover(parent1, parent2, config.genome_config)
+    child.mutate(config.genome_config)
+    population.reproduction.ancestors[key] = (parent1.key, parent2.key)
+    return child, chosen.key
+
+def remove_worst(population):
+    # take out the genome with the lowest fitness shared with its species
+    # (adjusted fitness), but never one of a species' elites
+    elitism = population.config.reproduction_config.elitism
+    candidates = []
+    for s in population.species.species.values():
+        members = sorted(s.members.values(), key=lambda genome: genome.fitness, reverse=True)
+        for genome in members[elitism:]:
+            candidates.append((genome.fitness / len(members), genome.key, s))
+    # if every genome is an elite, the worst of them has to go anyway
+    if not candidates:
+        for s in population.species.species.values():
+            for genome in s.members.values():
+                candidates.append((genome.fitness / len(s.members), genome.key, s))
+    adjusted_fitness, key, species = min(candidates, key=lambda candidate: candidate[0])
+    del population.population[key]
+    del species.members[key]
+    del population.species.genome_to_species[key]
+    # a species without members is gone
+    if not species.members:
+        del population.species.species[species.key]
+
+def run_steady_state(config, evaluations, workers=None, slots=None, seed=None,
+                     decision_interval=1):
+    # rtNEAT style evolution: every time a bird dies its slot gets a newly
+    # bred genome right away, so every worker always has a bird to play.
+    # returns the best genome found
+    population = neat.Population(config)
+    # birds played at once, a few more than workers so none waits on us
+    workers = workers or os.cpu_count()
+    pool = Pool(workers)
+    if slots is None:
+        slots = 2 * workers
+    finished = queue.Queue()
+
+    def start(genome, species_key=None):
+        # play the genome in a free slot, every game on its own course
+        # unless one was given
+        course_seed = seed if seed is not None else random.randrange(2**32)
+        pool.apply_async(parallel_game.play_genome,
+                         (genome, config, course_seed, decision_interval),
+                         callback=lambda fitness: finished.put((genome, species_key, fitness)),
+                         error_callback=lambda error: finished.put((genome, species_key, error)))
+
+    # the first population is played as it is, then it's replaced one
+    # genome at a time. until then, new genomes only live in the slots
+    waiting = list(population.population.values())
+    population.population = {}
+    playing = 0
+    for genome in waiting[:slots]:
+        start(genome)
+        playing += 1
+    waiting = waiting[slots:]
+
+    best_genome = None
+    done = 0
+    start_time = time.perf_counter()
+    try:
+        while done < evaluations:
+            genome, species_key, fitness = finished.get()
+            playing -= 1
+            if isinstance(fitness, Exception):
+                raise fitness
+            genome.fitness = fitness
+            done += 1
+            if best_genome is None or fitness > best_genome.fitness:
+                best_genome = genome
+
+            population.population[genome.key] = genome
+            if len(population.population) == config.pop_size and not population.species.species:
+                # the first population is complete, sort it into species
+                population.species.speciate(config, population.population, population.generation)
+            elif species_key in population.species.species:
+                # a child joins its parents' species and pushes the worst out
+                population.species.species[species_key].members[genome.key] = genome
+                population.species.genome_to_species[genome.key] = species_key
+                remove_worst(population)
+            elif population.species.species:
+                # its parents' species died out while it was playing
+                population.species.speciate(config, population.population, population.generation)
+                remove_worst(population)
+
+            # every population's worth of evaluations counts as a generation:
+            # sort everyone into species again and report
+            if done % config.pop_size == 0:
+                population.generation += 1
+                population.species.speciate(config, population.population, population.generation)
+                elapsed = time.perf_counter() - start_time
+                print("Evaluations: {0}, best fitness {1:.1f}, species {2}, {3:.1f} evaluations/sec".format(
+                    done, best_genome.fitness, len(population.species.species), done / elapsed))
+
+            if best_genome.fitness >= config.fitness_threshold:
+                break
+
+            # refill the free slots at once, with the rest of the first
+            # population or, once that's sorted into species, with children
+            while playing < slots and done + playing < evaluations:
+                if waiting:
+                    start(waiting.pop(0))
+                elif population.species.species:
+                    child, species_key = breed(population)
+                    start(child, species_key)
+                else:
+                    break
+                playing += 1
+    finally:
+        pool.terminate()
+        pool.join()
+
+    elapsed = time.perf_counter() - start_time
+    print("Steady state: {0} evaluations in {1:.1f} sec, {2:.1f} evaluations/sec, best fitness {3:.1f}".format(
+        done, elapsed, done / elapsed, best_genome.fitness))
+    return best_genome
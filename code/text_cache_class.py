@@ -0,0 +1,59 @@
+import assets
+from collections import OrderedDict
+
+class TextCache:
+    # how many different strings we keep rendered
+    SIZE = 128
+
+    def __init__(self, font_name, font_size, color=(255, 255, 255), size=SIZE):
+        # font and color every string is rendered with. the font is only
+        # opened when the first string is rendered
+        self.font_name = font_name
+        self.font_size = font_size
+        self.color = color
+        # maximum number of strings kept
+        self.size = size
+        # rendered strings, least recently used first
+        self.surfaces = OrderedDict()
+        # one rendered glyph per digit, for numbers that change all the time
+        self.digits = None
+
+    @property
+    def font(self):
+        # the font from the asset registry, opened on first use
+        return assets.font(self.font_name, self.font_size)
+
+    def digit_glyphs(self):
+        # render the ten digits the first time a number is drawn
+        if self.digits is None:
+            self.digits = [self.font.render(str(digit), 1, self.color) for digit in range(10)]
+        return self.digits
+
+    def render(self, text):
+        # hand back the rendered text, only rasterizing strings we haven't
+        # seen recently
+        surface = self.surfaces.get(text)
+        if surface is None:
+            surface = self.font.render(text, 1, self.color)
+            self.surfaces[text] = surface
+            # forget the least recently used string if we have too many
+            if len(self.surfaces) > self.size:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(text)
+        return surface
+
+    def blit_number(self, window, label, number, position):
+        # draw a cached label followed by the number built from cached digit
+        # glyphs, so a changing number never goes through the font renderer.
+        # returns the area drawn over
+        x, y = position
+        label_surface = self.render(label)
+        rectangle = window.blit(label_surface, (x, y))
+        x += label_surface.get_width()
+        digits = self.digit_glyphs()
+        for digit in str(number):
+            glyph = digits[int(digit)]
+            rectangle.union_ip(window.blit(glyph, (x, y)))
+            x += glyph.get_width()
+        return rectangle